@@ -0,0 +1,25 @@
+import asyncio
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+from app.background.job_runner import fail_stale_jobs, heartbeat_pending_jobs
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def run_job_monitor() -> None:
+    """
+    Keep this process's jobs alive and fail abandoned ones; runs for the
+    app lifetime, starting with a pass at startup.
+    """
+    while True:
+        try:
+            await run_in_threadpool(heartbeat_pending_jobs)
+            failed = await run_in_threadpool(fail_stale_jobs)
+            if failed:
+                logger.warning("Marked %s abandoned jobs as failed", failed)
+        except Exception:
+            logger.exception("Job monitor pass failed")
+        await asyncio.sleep(settings.JOB_HEARTBEAT_INTERVAL)
@@ -0,0 +1,192 @@
+import logging
+import multiprocessing
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, UTC
+from functools import partial
+
+from sqlalchemy import func, update
+
+from app.background.reports import REPORTS
+from app.config import settings
+from app.database import Sessao_, session_for_store, shard_router
+from app.logging_config import setup_logging
+from app.models import all_models  # noqa: F401  (spawned workers start from a fresh interpreter)
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+_executor: ProcessPoolExecutor | None = None
+# Futures of the jobs submitted by this process, with their (store_id, job_id)
+_pending: dict[Future, tuple[str, int]] = {}
+_lock = threading.Lock()
+
+
+def _set_job_status(store_id: str, job_id: int, **values) -> None:
+    db = session_for_store(store_id)
+    try:
+        db.execute(update(Job).where(Job.id == job_id).values(**values))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_job(store_id: str, job_id: int, kind: str) -> None:
+    """
+    Run one job inside a worker process and record the outcome.
+
+    The result is written to a `.part` file and renamed when complete, so
+    a finished job never points at a truncated file.
+    """
+    _set_job_status(store_id, job_id, status="running", started_at=datetime.now(UTC))
+    directory = os.path.join(settings.JOB_RESULTS_DIR, store_id)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.abspath(os.path.join(directory, f"{job_id}-{kind}.csv"))
+
+    db = session_for_store(store_id)
+    try:
+        with open(path + ".part", "w", newline="", encoding="utf-8") as output:
+            rows = REPORTS[kind](db, output)
+        os.replace(path + ".part", path)
+    except Exception as exc:
+        logger.exception("Job %s (%s) failed", job_id, kind)
+        if os.path.exists(path + ".part"):
+            os.remove(path + ".part")
+        _set_job_status(
+            store_id, job_id,
+            status="failed", error=f"{type(exc).__name__}: {exc}", finished_at=datetime.now(UTC)
+        )
+        return
+    finally:
+        db.close()
+
+    _set_job_status(
+        store_id, job_id,
+        status="done", result_path=path, result_rows=rows, finished_at=datetime.now(UTC)
+    )
+
+
+def _job_finished(store_id: str, job_id: int, future: Future) -> None:
+    """Mark jobs whose worker died or that were cancelled at shutdown as failed."""
+    with _lock:
+        _pending.pop(future, None)
+    if future.cancelled():
+        error = "Cancelled at shutdown"
+    elif future.exception() is not None:
+        error = f"Worker crashed: {future.exception()!r}"
+    else:
+        return
+    logger.error("Job %s failed: %s", job_id, error)
+    _set_job_status(store_id, job_id, status="failed", error=error, finished_at=datetime.now(UTC))
+
+
+def _new_executor() -> ProcessPoolExecutor:
+    # spawn: workers must not inherit the parent's open database connections
+    return ProcessPoolExecutor(
+        max_workers=settings.JOB_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=setup_logging,
+    )
+
+
+def submit_job(store_id: str, job_id: int, kind: str) -> bool:
+    """
+    Queue a job on the process pool.
+
+    Returns:
+        False if JOB_MAX_PENDING jobs are already queued or running
+    """
+    global _executor
+    with _lock:
+        if len(_pending) >= settings.JOB_MAX_PENDING:
+            return False
+        if _executor is None:
+            _executor = _new_executor()
+        try:
+            future = _executor.submit(run_job, store_id, job_id, kind)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); replace the pool
+            _executor = _new_executor()
+            future = _executor.submit(run_job, store_id, job_id, kind)
+        _pending[future] = (store_id, job_id)
+    future.add_done_callback(partial(_job_finished, store_id, job_id))
+    return True
+
+
+def shutdown_job_runner() -> None:
+    """Stop the pool; queued jobs are cancelled, running ones are not waited for."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def heartbeat_pending_jobs() -> int:
+    """
+    Refresh the heartbeat of the jobs this process submitted.
+
+    Returns:
+        Number of jobs refreshed
+    """
+    with _lock:
+        pending = list(_pending.values())
+    job_ids_by_store: dict[str, list[int]] = defaultdict(list)
+    for store_id, job_id in pending:
+        job_ids_by_store[store_id].append(job_id)
+
+    refreshed = 0
+    for store_id, job_ids in job_ids_by_store.items():
+        db = session_for_store(store_id)
+        try:
+            result = db.execute(
+                update(Job)
+                .where(Job.id.in_(job_ids), Job.status.in_(("queued", "running")))
+                .values(heartbeat_at=datetime.now(UTC))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            refreshed += result.rowcount
+        finally:
+            db.close()
+    return refreshed
+
+
+def fail_stale_jobs() -> int:
+    """
+    Mark queued or running jobs whose process stopped refreshing them as failed.
+
+    Covers jobs left behind by a crashed or restarted API process, which
+    clients would otherwise poll forever. Jobs of live processes, including
+    other workers on other hosts, keep a fresh heartbeat and are left alone.
+
+    Returns:
+        Number of jobs marked failed
+    """
+    now = datetime.now(UTC)
+    cutoff = now - timedelta(seconds=settings.JOB_STALE_AFTER)
+    failed = 0
+    for shard_engine in shard_router.engines():
+        db = Sessao_(bind=shard_engine)
+        try:
+            result = db.execute(
+                update(Job)
+                .where(
+                    Job.status.in_(("queued", "running")),
+                    func.coalesce(Job.heartbeat_at, Job.created_at) < cutoff
+                )
+                .values(
+                    status="failed",
+                    error="Abandoned: the API process running it stopped",
+                    finished_at=now
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            failed += result.rowcount
+        finally:
+            db.close()
+    return failed
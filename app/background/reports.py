@@ -0,0 +1,85 @@
+import csv
+from typing import TextIO
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.bill import Bill
+from app.models.billitem import BillItem
+from app.models.stock import Stock
+
+# Rows fetched per round trip; exports stream instead of loading whole tables
+FETCH_SIZE = 5000
+
+
+def export_bill_history(db: Session, output: TextIO) -> int:
+    """
+    Write every bill line of the store as CSV, one row per bill item.
+
+    Driven from bill_item with primary key lookups into bill and stock,
+    so the cost grows with the number of lines; bills without lines have
+    nothing to export.
+
+    Returns:
+        Number of data rows written
+    """
+    writer = csv.writer(output)
+    writer.writerow([
+        "bill_id", "customer_name", "status", "bill_created_at", "item_id",
+        "stock_id", "product", "quantity", "unit_price", "line_total", "item_created_at",
+    ])
+    rows = db.execute(
+        select(
+            Bill.id, Bill.customer_name, Bill.status, Bill.created_at,
+            BillItem.id, BillItem.stock_id, Stock.product, BillItem.quantity,
+            BillItem.unit_price, BillItem.quantity * BillItem.unit_price, BillItem.created_at
+        )
+        .select_from(BillItem)
+        .join(Bill, Bill.id == BillItem.bill_id)
+        .outerjoin(Stock, Stock.id == BillItem.stock_id)
+        .order_by(BillItem.bill_id, BillItem.id)
+        .execution_options(yield_per=FETCH_SIZE)
+    )
+    written = 0
+    for partition in rows.partitions():
+        writer.writerows(
+            (*row[:9], round(row[9], 2), row[10]) for row in partition
+        )
+        written += len(partition)
+    return written
+
+
+def export_inventory_valuation(db: Session, output: TextIO) -> int:
+    """
+    Write the cost value of every stock item (quantity * product_buy) as
+    CSV, most valuable first, followed by a total row.
+
+    Returns:
+        Number of stock rows written
+    """
+    writer = csv.writer(output)
+    writer.writerow(["stock_id", "product", "category", "quantity", "product_buy", "value"])
+    value = Stock.quantity * Stock.product_buy
+    rows = db.execute(
+        select(Stock.id, Stock.product, Stock.category, Stock.quantity, Stock.product_buy, value)
+        .order_by(value.desc().nulls_last(), Stock.id)
+        .execution_options(yield_per=FETCH_SIZE)
+    )
+    written = 0
+    total = 0.0
+    for partition in rows.partitions():
+        for row in partition:
+            total += row[-1] or 0.0
+        writer.writerows(
+            (*row[:-1], round(row[-1], 2) if row[-1] is not None else None) for row in partition
+        )
+        written += len(partition)
+    writer.writerow(["TOTAL", None, None, None, None, round(total, 2)])
+    return written
+
+
+# Job kind -> report writer
+REPORTS = {
+    "bill_history": export_bill_history,
+    "inventory_valuation": export_inventory_valuation,
+}
@@ -0,0 +1,49 @@
+import asyncio
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.crud.reservation_crud import release_expired_reservations
+from app.database import Sessao_, shard_router
+
+logger = logging.getLogger(__name__)
+
+
+def sweep_expired_reservations(batch_size: int) -> int:
+    """
+    Release expired reservations of every shard in batches until none are left.
+
+    Each batch is its own short transaction so the sweep never holds
+    locks on many stock rows at once. Sessions are not scoped to a store,
+    so one pass covers every store sharing a database.
+
+    Returns:
+        Total number of reservations released
+    """
+    total = 0
+    for shard_engine in shard_router.engines():
+        db = Sessao_(bind=shard_engine)
+        try:
+            while True:
+                released = release_expired_reservations(db, batch_size)
+                total += released
+                if released < batch_size:
+                    break
+        finally:
+            db.close()
+    return total
+
+
+async def run_reservation_sweeper() -> None:
+    """Periodically release expired reservations; runs for the app lifetime."""
+    while True:
+        await asyncio.sleep(settings.RESERVATION_SWEEP_INTERVAL)
+        try:
+            released = await run_in_threadpool(
+                sweep_expired_reservations, settings.RESERVATION_SWEEP_BATCH
+            )
+            if released:
+                logger.info("Released %s expired reservations", released)
+        except Exception:
+            logger.exception("Reservation sweep failed")
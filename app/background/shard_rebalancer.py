@@ -0,0 +1,39 @@
+import asyncio
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.crud.stock_shard_crud import rebalance_stock_shards
+from app.database import Sessao_, shard_router
+
+logger = logging.getLogger(__name__)
+
+
+def rebalance_all_shards() -> int:
+    """
+    Rebalance the sharded stock items of every database.
+
+    Returns:
+        Number of stock items updated
+    """
+    total = 0
+    for shard_engine in shard_router.engines():
+        db = Sessao_(bind=shard_engine)
+        try:
+            total += rebalance_stock_shards(db)
+        finally:
+            db.close()
+    return total
+
+
+async def run_shard_rebalancer() -> None:
+    """Periodically rebalance sharded stock counters; runs for the app lifetime."""
+    while True:
+        await asyncio.sleep(settings.STOCK_SHARD_REBALANCE_INTERVAL)
+        try:
+            updated = await run_in_threadpool(rebalance_all_shards)
+            if updated:
+                logger.debug("Rebalanced %s sharded stock items", updated)
+        except Exception:
+            logger.exception("Stock shard rebalance failed")
@@ -0,0 +1,230 @@
+"""
+Host-wide snapshot of the stock catalogue, shared by every worker process.
+
+Each store has three small files in CATALOGUE_CACHE_DIR (a tmpfs by
+default):
+
+- `<key>.generation`: an 8-byte counter, memory-mapped by every worker and
+  bumped after each commit that changes stock rows
+- `<key>.snapshot`: the catalogue serialized as a JSON array, plus a sorted
+  id index, tagged with the generation it was built at
+- `<key>.lock`: taken by the one worker that rebuilds a stale snapshot
+
+Workers map the snapshot read-only, so the page cache holds a single copy
+per host however many workers there are. A snapshot is only served while
+its generation matches the counter, and the counter is read before the
+rebuild query, so a commit that lands during a rebuild always leaves the
+new snapshot stale rather than silently missing.
+
+Only commits made through this code on this host bump the counter; writes
+from elsewhere (another host, manual SQL) are picked up when the snapshot
+reaches CATALOGUE_CACHE_MAX_AGE.
+
+Cross-process locking uses flock; without it (Windows) the cache is off and
+reads go to the database.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.engine import URL
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import shard_router
+from app.models.stock import Stock
+from app.schemas.stock_schema import StockResponse
+
+# magic, generation, build time, row count; then the ids (int64, sorted),
+# the row offsets (int64, count + 1) and the JSON body `[row,row,...]`
+_HEADER = struct.Struct("<8sQdQ")
+_MAGIC = b"CATALOG1"
+_COUNTER = struct.Struct("<Q")
+_COLUMNS = [getattr(Stock, field) for field in StockResponse.model_fields]
+
+
+@contextmanager
+def _flock(fd: int, blocking: bool = True):
+    """Hold an exclusive flock; yields False if non-blocking and busy."""
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class CatalogueSnapshot:
+    """Read-only view over a mapped snapshot file; nothing is copied."""
+
+    def __init__(self, buffer: mmap.mmap) -> None:
+        magic, self.generation, self.built_at, count = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not a catalogue snapshot")
+        offset = _HEADER.size
+        self.ids = np.frombuffer(buffer, dtype="<i8", count=count, offset=offset)
+        self.bounds = np.frombuffer(buffer, dtype="<i8", count=count + 1, offset=offset + 8 * count)
+        self.body = memoryview(buffer)[offset + 16 * count + 8:]
+
+    def is_current(self, generation: int) -> bool:
+        return self.generation == generation and time.time() - self.built_at < settings.CATALOGUE_CACHE_MAX_AGE
+
+    def all_json(self) -> bytes:
+        """Every stock item, as the JSON array the list endpoint returns."""
+        return bytes(self.body)
+
+    def row_json(self, stock_id: int) -> bytes | None:
+        """One stock item as JSON, or None if it does not exist."""
+        position = int(np.searchsorted(self.ids, stock_id))
+        if position == len(self.ids) or self.ids[position] != stock_id:
+            return None
+        return bytes(self.body[self.bounds[position]:self.bounds[position + 1] - 1])
+
+
+class CatalogueCache:
+    """Shared catalogue cache of one store on one database."""
+
+    def __init__(self, directory: str, key: str) -> None:
+        self.snapshot_path = os.path.join(directory, f"{key}.snapshot")
+        self._counter_fd = os.open(os.path.join(directory, f"{key}.generation"), os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._counter_fd).st_size < _COUNTER.size:
+            os.ftruncate(self._counter_fd, _COUNTER.size)
+        self._counter = mmap.mmap(self._counter_fd, _COUNTER.size)
+        self._rebuild_fd = os.open(os.path.join(directory, f"{key}.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        # flock does not exclude threads sharing a descriptor
+        self._counter_lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._snapshot: CatalogueSnapshot | None = None
+
+    @property
+    def generation(self) -> int:
+        return _COUNTER.unpack_from(self._counter)[0]
+
+    def bump(self) -> None:
+        """Invalidate the snapshot in every worker on the host."""
+        with self._counter_lock, _flock(self._counter_fd):
+            _COUNTER.pack_into(self._counter, 0, self.generation + 1)
+
+    def snapshot(self, db: Session) -> CatalogueSnapshot | None:
+        """
+        Current snapshot, rebuilding it if stale or too old.
+
+        Only one worker rebuilds at a time; the others get None and read the
+        database directly instead of queueing behind it.
+
+        Args:
+            db: Session of the store the cache belongs to
+
+        Returns:
+            Snapshot matching the current generation, or None
+        """
+        if self._snapshot is not None and self._snapshot.is_current(self.generation):
+            return self._snapshot
+        if not self._rebuild_lock.acquire(blocking=False):
+            return None
+        try:
+            with _flock(self._rebuild_fd, blocking=False) as locked:
+                if not locked:
+                    return None
+                # Read before querying: a commit after this point bumps past it
+                generation = self.generation
+                snapshot = self._load()
+                if snapshot is None or not snapshot.is_current(generation):
+                    self._build(db, generation)
+                    snapshot = self._load()
+                self._snapshot = snapshot
+                return snapshot
+        finally:
+            self._rebuild_lock.release()
+
+    def _load(self) -> CatalogueSnapshot | None:
+        """Map the snapshot file currently on disk, if any."""
+        try:
+            with open(self.snapshot_path, "rb") as file:
+                return CatalogueSnapshot(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _build(self, db: Session, generation: int) -> None:
+        """Serialize the catalogue and atomically replace the snapshot file."""
+        ids, rows = [], []
+        for row in db.execute(select(*_COLUMNS).order_by(Stock.id)):
+            ids.append(row.id)
+            rows.append(StockResponse.model_validate(row._mapping).model_dump_json().encode())
+
+        # Row i spans bounds[i] up to the comma (or bracket) before bounds[i + 1]
+        bounds = np.cumsum([1] + [len(row) + 1 for row in rows], dtype="<i8")
+        temp_path = f"{self.snapshot_path}.{os.getpid()}"
+        with open(temp_path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, generation, time.time(), len(ids)))
+            file.write(np.array(ids, dtype="<i8").tobytes())
+            file.write(bounds.tobytes())
+            file.write(b"[" + b",".join(rows) + b"]")
+        os.replace(temp_path, self.snapshot_path)
+
+
+_caches: dict[str, CatalogueCache] = {}
+_caches_lock = threading.Lock()
+
+
+def catalogue_cache(url: URL | str, store_id: str) -> CatalogueCache | None:
+    """
+    Shared catalogue cache of a store on a database, or None when disabled.
+
+    Args:
+        url: Database URL; caches of different databases never collide
+        store_id: Store owning the catalogue
+    """
+    if not settings.CATALOGUE_CACHE_DIR or fcntl is None:
+        return None
+    key = hashlib.sha1(f"{url}|{store_id}".encode()).hexdigest()[:16]
+    with _caches_lock:
+        if key not in _caches:
+            os.makedirs(settings.CATALOGUE_CACHE_DIR, exist_ok=True)
+            _caches[key] = CatalogueCache(settings.CATALOGUE_CACHE_DIR, key)
+        return _caches[key]
+
+
+def get_catalogue_snapshot(db: Session) -> CatalogueSnapshot | None:
+    """
+    Current catalogue snapshot of the session's store.
+
+    Returns:
+        Snapshot, or None when the cache is disabled or being rebuilt by
+        another worker (read the database instead)
+    """
+    store_id = db.info.get("store_id", settings.DEFAULT_STORE_ID)
+    cache = catalogue_cache(db.get_bind().url, store_id)
+    return cache.snapshot(db) if cache else None
+
+
+def bump_catalogue_generation(db: Session) -> None:
+    """
+    Invalidate the catalogue snapshot after a commit that changed stock rows.
+
+    Sessions without a store (background tasks) cover every store of their
+    database, so all of them are invalidated.
+    """
+    bind = db.get_bind()
+    store_id = db.info.get("store_id")
+    stores = [store_id] if store_id else [
+        store for store in shard_router.stores if shard_router.engine_for(store) is bind
+    ]
+    for store in stores:
+        cache = catalogue_cache(bind.url, store)
+        if cache:
+            cache.bump()
@@ -1,4 +1,6 @@
+import json
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -13,10 +15,26 @@ class Settings:
         "sqlite:///./test.db"  # Default to SQLite for development
     )
     
+    # Multi-store sharding: SHARD_MAP is a JSON object of store id to
+    # database URL; the default store uses DATABASE_URL unless mapped there
+    DEFAULT_STORE_ID: str = os.getenv("DEFAULT_STORE_ID", "default")
+    SHARD_MAP: dict = {
+        DEFAULT_STORE_ID: DATABASE_URL,
+        **json.loads(os.getenv("SHARD_MAP", "{}")),
+    }
+    
     # Application settings
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     
+    # Logging: LOG_FORMAT is "json" or "text"; SQL statements are logged
+    # only when SQL_LOG_LEVEL is INFO (or DEBUG for result rows)
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json").lower()
+    SQL_LOG_LEVEL: str = os.getenv("SQL_LOG_LEVEL", "WARNING").upper()
+    LOG_ACCESS_SAMPLE_RATE: float = float(os.getenv("LOG_ACCESS_SAMPLE_RATE", "1.0"))
+    LOG_HEALTH_SAMPLE_RATE: float = float(os.getenv("LOG_HEALTH_SAMPLE_RATE", "0.01"))
+    
     # API configuration
     API_TITLE: str = "Sistema de Estoque e Comandas"
     API_VERSION: str = "2.0.0"
@@ -27,6 +45,74 @@ class Settings:
         "ALLOWED_ORIGINS",
         "http://localhost,http://localhost:3000,http://localhost:8000"
     ).split(",")
+
+    # Response compression (bodies smaller than this are sent as-is)
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "500"))
+
+    # Admission control: concurrent requests and queued requests per route
+    # class. Defaults add up to the SQLAlchemy pool (5 + 10 overflow).
+    ADMISSION_WRITE_CONCURRENCY: int = int(os.getenv("ADMISSION_WRITE_CONCURRENCY", "5"))
+    ADMISSION_WRITE_QUEUE: int = int(os.getenv("ADMISSION_WRITE_QUEUE", "50"))
+    ADMISSION_READ_CONCURRENCY: int = int(os.getenv("ADMISSION_READ_CONCURRENCY", "8"))
+    ADMISSION_READ_QUEUE: int = int(os.getenv("ADMISSION_READ_QUEUE", "100"))
+    ADMISSION_ANALYTICS_CONCURRENCY: int = int(os.getenv("ADMISSION_ANALYTICS_CONCURRENCY", "2"))
+    ADMISSION_ANALYTICS_QUEUE: int = int(os.getenv("ADMISSION_ANALYTICS_QUEUE", "5"))
+    ADMISSION_QUEUE_TIMEOUT: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2.0"))
+    ADMISSION_ANALYTICS_PREFIXES: list = os.getenv(
+        "ADMISSION_ANALYTICS_PREFIXES",
+        "/api/v1/analytics,/api/v1/reports,/api/v1/jobs"
+    ).split(",")
+
+    # Stock reservations: default hold time and expired-hold sweeper
+    RESERVATION_TTL_SECONDS: int = int(os.getenv("RESERVATION_TTL_SECONDS", "900"))
+    RESERVATION_SWEEP_INTERVAL: float = float(os.getenv("RESERVATION_SWEEP_INTERVAL", "30"))
+    RESERVATION_SWEEP_BATCH: int = int(os.getenv("RESERVATION_SWEEP_BATCH", "500"))
+
+    # Delta sync: rows changed in the last SYNC_SAFETY_LAG_SECONDS are held
+    # back so transactions still committing are not skipped by the cursor
+    SYNC_SAFETY_LAG_SECONDS: float = float(os.getenv("SYNC_SAFETY_LAG_SECONDS", "2"))
+
+    # Reorder-point forecast: demand is averaged over the last WINDOW days,
+    # variability over the whole HISTORY; Z is the service level (1.65 ~ 95%)
+    FORECAST_HISTORY_DAYS: int = int(os.getenv("FORECAST_HISTORY_DAYS", "365"))
+    FORECAST_WINDOW_DAYS: int = int(os.getenv("FORECAST_WINDOW_DAYS", "28"))
+    FORECAST_LEAD_TIME_DAYS: float = float(os.getenv("FORECAST_LEAD_TIME_DAYS", "7"))
+    FORECAST_SERVICE_Z: float = float(os.getenv("FORECAST_SERVICE_Z", "1.65"))
+
+    # Background jobs run in a process pool; results are files on local disk
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_MAX_PENDING: int = int(os.getenv("JOB_MAX_PENDING", "20"))
+    JOB_RESULTS_DIR: str = os.getenv("JOB_RESULTS_DIR", "./job_results")
+    # Each API process refreshes the heartbeat of its own jobs; queued or
+    # running jobs not refreshed for JOB_STALE_AFTER seconds lost their
+    # process (crash, restart) and are marked failed
+    JOB_HEARTBEAT_INTERVAL: float = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "15"))
+    JOB_STALE_AFTER: float = float(os.getenv("JOB_STALE_AFTER", "60"))
+
+    # Sharded stock counters for hot SKUs: upper bound on shards per item and
+    # how often shards are evened out and their total copied to Stock.quantity
+    STOCK_SHARD_MAX: int = int(os.getenv("STOCK_SHARD_MAX", "32"))
+    STOCK_SHARD_REBALANCE_INTERVAL: float = float(os.getenv("STOCK_SHARD_REBALANCE_INTERVAL", "10"))
+
+    # Stock catalogue cache shared by all worker processes of a host, as
+    # memory-mapped files in this directory (tmpfs when available); set it
+    # empty to disable the cache. Snapshots are rebuilt after MAX_AGE seconds
+    # even without local changes, to pick up writes made from other hosts
+    CATALOGUE_CACHE_DIR: str = os.getenv(
+        "CATALOGUE_CACHE_DIR",
+        os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "estoque-catalogue")
+    )
+    CATALOGUE_CACHE_MAX_AGE: float = float(os.getenv("CATALOGUE_CACHE_MAX_AGE", "30"))
+
+    # Query budget per request (N+1 detector): "warn" logs requests running
+    # more statements than MAX_QUERIES, or the same SQL more than
+    # MAX_REPEATS times; "raise" fails them (tests); "off" disables it
+    QUERY_BUDGET_MODE: str = os.getenv(
+        "QUERY_BUDGET_MODE",
+        "warn" if ENVIRONMENT == "development" else "off"
+    ).lower()
+    QUERY_BUDGET_MAX_QUERIES: int = int(os.getenv("QUERY_BUDGET_MAX_QUERIES", "25"))
+    QUERY_BUDGET_MAX_REPEATS: int = int(os.getenv("QUERY_BUDGET_MAX_REPEATS", "5"))
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,35 @@
+from fastapi import status
+from sqlalchemy.orm import Session
+
+from app.crud.bill_crud import get_bills_by_ids
+from app.crud.stock_crud import get_stocks_by_ids
+
+
+def _entries(requested: list[int], found: dict, not_found: str) -> list[dict]:
+    """One entry per distinct requested id, keeping the request order."""
+    return [
+        {"id": item_id, "status": status.HTTP_200_OK, "data": found[item_id]}
+        if item_id in found else
+        {"id": item_id, "status": status.HTTP_404_NOT_FOUND, "detail": not_found}
+        for item_id in dict.fromkeys(requested)
+    ]
+
+
+def resolve_batch(db: Session, stock_ids: list[int], bill_ids: list[int]) -> dict:
+    """
+    Resolve several stock and bill reads with one query per resource type.
+
+    Missing ids get their own 404 entry instead of failing the batch.
+
+    Args:
+        db: Database session
+        stock_ids: IDs of the stock items to read
+        bill_ids: IDs of the bills to read (returned with their items)
+
+    Returns:
+        Dict with the stock and bill entries
+    """
+    return {
+        "stocks": _entries(stock_ids, get_stocks_by_ids(db, stock_ids), "Stock item not found"),
+        "bills": _entries(bill_ids, get_bills_by_ids(db, bill_ids), "Bill not found"),
+    }
@@ -1,8 +1,17 @@
+from collections import defaultdict
+
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from app.catalogue_cache import bump_catalogue_generation
 from app.models.bill import Bill
+from app.models.billitem import BillItem
+from app.models.tombstone import SyncTombstone
 from app.schemas.bill_schema import BillCreate, BillUpdate
+from app.schemas.billitem_schema import BillItemResponse
+from app.crud.billitem_crud import remove_bill_items
+from app.crud.reservation_crud import get_open_bill, release_bill_reservations
 
 
 def create_bill(db: Session, bill_data: BillCreate) -> Bill:
@@ -45,7 +54,84 @@ def get_all_bills(db: Session) -> list[Bill]:
     Returns:
         List of all Bill instances
     """
-    return db.query(Bill).all()
+    # Load items and their stock in two extra queries instead of one per bill
+    return (
+        db.query(Bill)
+        .options(selectinload(Bill.items).joinedload(BillItem.stock))
+        .all()
+    )
+
+
+def get_bills_by_ids(db: Session, bill_ids: list[int]) -> dict[int, Bill]:
+    """
+    Retrieve several bills with their items using a single IN query.
+
+    Args:
+        db: Database session
+        bill_ids: IDs of the bills
+
+    Returns:
+        Mapping of id to Bill for the bills that exist
+    """
+    if not bill_ids:
+        return {}
+    bills = (
+        db.query(Bill)
+        .options(selectinload(Bill.items).joinedload(BillItem.stock))
+        .filter(Bill.id.in_(bill_ids))
+        .all()
+    )
+    return {bill.id: bill for bill in bills}
+
+
+def get_bill_fields(
+    db: Session,
+    fields: list[str],
+    include_items: bool = False,
+    bill_id: int | None = None
+) -> list[dict]:
+    """
+    Retrieve bills selecting only the requested columns.
+
+    The bill_item/stock join is only issued when `include_items` is set.
+
+    Args:
+        db: Database session
+        fields: Bill column names to select (already validated)
+        include_items: Embed the bill items in each row
+        bill_id: Restrict the result to a single bill
+
+    Returns:
+        List of dicts keyed by the requested column names
+
+    Raises:
+        HTTPException: If a single bill was requested and not found
+    """
+    query = db.query(*[getattr(Bill, field) for field in fields])
+    if bill_id is not None:
+        query = query.filter(Bill.id == bill_id)
+
+    rows = [row._asdict() for row in query.all()]
+    if bill_id is not None and not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bill not found"
+        )
+
+    if include_items and rows:
+        items_query = db.query(BillItem).options(joinedload(BillItem.stock))
+        if bill_id is not None:
+            items_query = items_query.filter(BillItem.bill_id == bill_id)
+
+        items_by_bill: dict[int, list[dict]] = defaultdict(list)
+        for item in items_query.all():
+            items_by_bill[item.bill_id].append(
+                BillItemResponse.model_validate(item).model_dump()
+            )
+        for row in rows:
+            row["items"] = items_by_bill.get(row["id"], [])
+
+    return rows
 
 
 def get_bill_by_id(db: Session, bill_id: int) -> Bill:
@@ -62,7 +148,12 @@ def get_bill_by_id(db: Session, bill_id: int) -> Bill:
     Raises:
         HTTPException: If bill not found
     """
-    bill = db.query(Bill).filter(Bill.id == bill_id).first()
+    bill = (
+        db.query(Bill)
+        .options(selectinload(Bill.items).joinedload(BillItem.stock))
+        .filter(Bill.id == bill_id)
+        .first()
+    )
     if not bill:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -101,30 +192,35 @@ def update_bill(db: Session, bill_id: int, bill_data: BillUpdate) -> Bill:
 
     db.add(bill)
     db.commit()
-    db.refresh(bill)
-    return bill
+    # Reload with items and stock so serializing the response does not lazy-load them
+    return get_bill_by_id(db, bill_id)
 
 
 def delete_bill(db: Session, bill_id: int) -> None:
     """
-    Delete a bill by ID.
+    Delete a bill by ID together with its items, restoring their
+    quantities to stock, in one transaction.
 
     Args:
         db: Database session
         bill_id: ID of the bill to delete
 
     Raises:
-        HTTPException: If bill not found
+        HTTPException: If bill not found or already closed
     """
-    bill = db.query(Bill).filter(Bill.id == bill_id).first()
-    if not bill:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Bill not found"
-        )
-
+    # A closed bill is a completed sale: its units are not put back
+    bill = get_open_bill(db, bill_id, lock=True)
+
+    # Give back any stock still held or sold on this bill
+    release_bill_reservations(db, bill_id)
+    item_ids = list(db.execute(
+        select(BillItem.id).where(BillItem.bill_id == bill_id).with_for_update()
+    ).scalars())
+    remove_bill_items(db, item_ids)
     db.delete(bill)
+    db.add(SyncTombstone(entity="bill", entity_id=bill_id))
     db.commit()
+    bump_catalogue_generation(db)
 
 
 
@@ -1,10 +1,15 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import delete, func, insert, literal, select, update
 
+from app.catalogue_cache import bump_catalogue_generation
 from app.models.billitem import BillItem
 from app.models.bill import Bill
 from app.models.stock import Stock
+from app.models.stock_shard import StockShard
+from app.models.tombstone import SyncTombstone
+from app.crud.reservation_crud import get_open_bill
+from app.crud.stock_shard_crud import take_from_shards
 
 
 def create_bill_item(
@@ -28,15 +33,11 @@ def create_bill_item(
         Created BillItem instance
 
     Raises:
-        HTTPException: If bill, stock not found or insufficient stock quantity
+        HTTPException: If bill, stock not found, bill is closed or
+            insufficient stock quantity
     """
-    # Verify if bill exists
-    bill = db.query(Bill).filter(Bill.id == bill_id).first()
-    if not bill:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Bill not found"
-        )
+    # Verify if bill exists and is still open
+    get_open_bill(db, bill_id)
 
     # Verify if stock exists
     stock = db.query(Stock).filter(Stock.id == stock_id).first()
@@ -46,12 +47,29 @@ def create_bill_item(
             detail="Stock item not found"
         )
 
-    # Verify if stock quantity is sufficient
-    if stock.quantity < quantity:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Insufficient stock quantity. Available: {stock.quantity}, Requested: {quantity}"
+    if stock.shard_count:
+        # Hot SKU: take the units from one of its shards, the stock row is
+        # not locked
+        take_from_shards(db, stock_id, stock.shard_count, quantity)
+    else:
+        # Check and decrement in one statement so concurrent sales cannot
+        # oversell (units held by reservations of other bills are not available)
+        result = db.execute(
+            update(Stock)
+            .where(
+                Stock.id == stock_id,
+                Stock.quantity - Stock.reserved_quantity >= quantity
+            )
+            .values(quantity=Stock.quantity - quantity)
+            .execution_options(synchronize_session=False)
         )
+        if result.rowcount == 0:
+            available = (stock.quantity or 0) - stock.reserved_quantity
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Insufficient stock quantity. Available: {available}, Requested: {quantity}"
+            )
 
     # Use stock price when unit_price not provided
     if unit_price is None:
@@ -65,13 +83,129 @@ def create_bill_item(
         unit_price=unit_price
     )
 
-    # Decrease stock quantity
-    stock.quantity -= quantity
-
     # Add to session and commit
     db.add(bill_item)
-    db.add(stock)
     db.commit()
+    # Shard sales leave the stock row alone until the next rebalance
+    if not stock.shard_count:
+        bump_catalogue_generation(db)
     db.refresh(bill_item)
 
     return bill_item
+
+
+def remove_bill_items(db: Session, item_ids: list[int]) -> None:
+    """
+    Delete bill items and put their units back in stock without committing.
+
+    Set-based whatever the number of lines: the quantities are summed per
+    stock item in a subquery and restored with one UPDATE ... FROM for plain
+    items and one for sharded items (onto shard 0, the rebalancer spreads
+    them), then the items are tombstoned and deleted with one statement each.
+
+    Args:
+        db: Database session
+        item_ids: IDs of the bill items, already locked by the caller
+    """
+    if not item_ids:
+        return
+    voided = (
+        select(BillItem.stock_id, func.sum(BillItem.quantity).label("units"))
+        .where(BillItem.id.in_(item_ids))
+        .group_by(BillItem.stock_id)
+        .subquery()
+    )
+    db.execute(
+        update(Stock)
+        .where(Stock.id == voided.c.stock_id, Stock.shard_count == 0)
+        .values(quantity=func.coalesce(Stock.quantity, 0) + voided.c.units)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(StockShard)
+        .where(StockShard.stock_id == voided.c.stock_id, StockShard.shard_no == 0)
+        .values(quantity=StockShard.quantity + voided.c.units)
+        .execution_options(synchronize_session=False)
+    )
+    # Offline clients drop the lines on their next sync
+    db.execute(
+        insert(SyncTombstone).from_select(
+            ["entity", "entity_id", "store_id"],
+            select(literal("bill_item"), BillItem.id, BillItem.store_id).where(BillItem.id.in_(item_ids))
+        )
+    )
+    db.execute(
+        delete(BillItem)
+        .where(BillItem.id.in_(item_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _void_items(db: Session, bill_id: int, item_ids: list[int]) -> None:
+    """Lock, restore and delete items of an open bill; all or nothing, committed."""
+    # Units sold on a closed bill have left the store, they are not restocked
+    get_open_bill(db, bill_id, lock=True)
+
+    # Lock the lines so a concurrent void cannot restore the same units twice
+    requested = set(item_ids)
+    locked = set(db.execute(
+        select(BillItem.id)
+        .where(BillItem.bill_id == bill_id, BillItem.id.in_(requested))
+        .with_for_update()
+    ).scalars())
+    missing = sorted(requested - locked)
+    if missing:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bill items not found: {missing}"
+        )
+
+    remove_bill_items(db, sorted(locked))
+    db.commit()
+    bump_catalogue_generation(db)
+
+
+def void_bill_items(db: Session, bill_id: int, item_ids: list[int]) -> Bill:
+    """
+    Void (or return) several items of a bill in one transaction, restoring
+    their quantities to stock.
+
+    All or nothing: if any of the items is not on the bill nothing is voided.
+    Closed bills cannot be changed.
+
+    Args:
+        db: Database session
+        bill_id: ID of the bill
+        item_ids: IDs of the bill items to void
+
+    Returns:
+        Bill instance with its remaining items
+
+    Raises:
+        HTTPException: If bill or any of the items not found, or bill is
+            closed
+    """
+    _void_items(db, bill_id, item_ids)
+    db.expire_all()
+    return (
+        db.query(Bill)
+        .options(selectinload(Bill.items).joinedload(BillItem.stock))
+        .filter(Bill.id == bill_id)
+        .one()
+    )
+
+
+def void_bill_item(db: Session, bill_id: int, item_id: int) -> None:
+    """
+    Void a single bill item, restoring its quantity to stock.
+
+    Args:
+        db: Database session
+        bill_id: ID of the bill
+        item_id: ID of the bill item
+
+    Raises:
+        HTTPException: If bill or item not found, or bill is closed
+    """
+    _void_items(db, bill_id, [item_id])
@@ -0,0 +1,62 @@
+from fastapi import HTTPException, status
+
+
+def parse_fieldset(raw: str | None, allowed: set[str]) -> list[str] | None:
+    """
+    Parse a comma separated `?fields=` query value.
+
+    The primary key is always part of the result so clients can still
+    address the returned rows.
+
+    Args:
+        raw: Raw query string value (e.g. "id,product,quantity")
+        allowed: Column names the resource exposes
+
+    Returns:
+        Ordered list of requested fields, or None when no fieldset was given
+
+    Raises:
+        HTTPException: If an unknown field is requested
+    """
+    if raw is None:
+        return None
+
+    fields = [field.strip() for field in raw.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+
+    if "id" not in fields:
+        fields.insert(0, "id")
+    # Drop duplicates while keeping the order requested by the client
+    return list(dict.fromkeys(fields))
+
+
+def parse_include(raw: str | None, allowed: set[str]) -> set[str]:
+    """
+    Parse a comma separated `?include=` query value.
+
+    Args:
+        raw: Raw query string value (e.g. "items")
+        allowed: Relationship names the resource can embed
+
+    Returns:
+        Set of relationships to embed
+
+    Raises:
+        HTTPException: If an unknown relationship is requested
+    """
+    if raw is None:
+        return set()
+
+    include = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = include - allowed
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}"
+        )
+    return include
@@ -0,0 +1,199 @@
+import threading
+from datetime import date, datetime, time, timedelta, UTC
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.billitem import BillItem
+from app.models.stock import Stock
+
+# store id -> (data version, forecast); recomputed only when the version moves
+_forecast_cache: dict[str, tuple[tuple, dict]] = {}
+# One lock per store, so a slow forecast of one store never blocks another
+_forecast_locks: dict[str, threading.Lock] = {}
+_forecast_locks_lock = threading.Lock()
+
+
+def _forecast_lock(store_id: str) -> threading.Lock:
+    with _forecast_locks_lock:
+        return _forecast_locks.setdefault(store_id, threading.Lock())
+
+
+def _data_version(db: Session, today: date) -> tuple:
+    """
+    Cheap token that changes whenever sales or stock levels change.
+
+    One max() per statement, so each is answered from the end of its
+    index; the day is part of it because the demand window moves every
+    midnight.
+    """
+    return (
+        today,
+        db.execute(select(func.max(BillItem.id))).scalar(),
+        db.execute(select(func.max(BillItem.updated_at))).scalar(),
+        db.execute(select(func.max(Stock.updated_at))).scalar(),
+    )
+
+
+def compute_reorder_points(db: Session, today: date) -> dict:
+    """
+    Forecast demand and reorder points for every SKU of the store.
+
+    History is read with one aggregate query (units per SKU per day) and
+    turned into columns; all statistics are NumPy operations over the whole
+    catalogue, with days without sales counted as zero demand.
+
+    Args:
+        db: Store-scoped database session
+        today: First day excluded from the history (only full days count)
+
+    Returns:
+        Dict of column arrays indexed by SKU (stock_id, product, on_hand,
+        available, avg_daily_demand, demand_std, days_of_cover,
+        reorder_point, suggested_order) plus generated_at
+    """
+    history_days = settings.FORECAST_HISTORY_DAYS
+    window_days = min(settings.FORECAST_WINDOW_DAYS, history_days)
+    lead_time = settings.FORECAST_LEAD_TIME_DAYS
+    end = datetime.combine(today, time.min, UTC)
+
+    stock_rows = db.execute(
+        select(
+            Stock.id,
+            Stock.product,
+            func.coalesce(Stock.quantity, 0),
+            Stock.reserved_quantity
+        ).order_by(Stock.id)
+    ).all()
+    stock_ids, products, on_hand, reserved = (
+        (np.array(column) for column in zip(*stock_rows)) if stock_rows
+        else (np.empty(0, dtype=np.int64), np.empty(0, dtype=object), np.empty(0), np.empty(0))
+    )
+    sku_count = len(stock_ids)
+
+    day = func.date(BillItem.created_at)
+    history = db.execute(
+        select(BillItem.stock_id, day, func.sum(BillItem.quantity))
+        .where(
+            BillItem.created_at >= end - timedelta(days=history_days),
+            BillItem.created_at < end
+        )
+        .group_by(BillItem.stock_id, day)
+    ).all()
+
+    if history and sku_count:
+        item_stock, item_day, item_units = zip(*history)
+        item_stock = np.array(item_stock, dtype=np.int64)
+        # Map stock ids to catalogue positions; sales of deleted SKUs are dropped
+        positions = np.minimum(np.searchsorted(stock_ids, item_stock), sku_count - 1)
+        known = stock_ids[positions] == item_stock
+        age = (np.datetime64(today, "D") - np.array(item_day, dtype="datetime64[D]")).astype(np.int64)
+        positions, age = positions[known], age[known]
+        units = np.array(item_units, dtype=np.float64)[known]
+    else:
+        positions = np.empty(0, dtype=np.int64)
+        age = np.empty(0, dtype=np.int64)
+        units = np.empty(0)
+
+    total = np.bincount(positions, weights=units, minlength=sku_count)
+    total_squares = np.bincount(positions, weights=units ** 2, minlength=sku_count)
+    recent = age <= window_days
+    recent_total = np.bincount(positions[recent], weights=units[recent], minlength=sku_count)
+
+    avg_daily_demand = recent_total / window_days
+    history_mean = total / history_days
+    demand_std = np.sqrt(np.maximum(total_squares / history_days - history_mean ** 2, 0.0))
+
+    available = on_hand - reserved
+    reorder_point = avg_daily_demand * lead_time + settings.FORECAST_SERVICE_Z * demand_std * np.sqrt(lead_time)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_of_cover = np.where(avg_daily_demand > 0, available / avg_daily_demand, np.inf)
+    suggested_order = np.ceil(np.maximum(reorder_point - available, 0.0))
+
+    return {
+        "generated_at": datetime.now(UTC),
+        "window_days": window_days,
+        "lead_time_days": lead_time,
+        "stock_id": stock_ids,
+        "product": products,
+        "on_hand": on_hand,
+        "available": available,
+        "avg_daily_demand": avg_daily_demand,
+        "demand_std": demand_std,
+        "days_of_cover": days_of_cover,
+        "reorder_point": reorder_point,
+        "suggested_order": suggested_order,
+    }
+
+
+def get_cached_reorder_points(db: Session) -> dict:
+    """
+    Forecast of the session's store, recomputed only after new sales or
+    stock changes.
+
+    Args:
+        db: Store-scoped database session
+
+    Returns:
+        Forecast columns as returned by `compute_reorder_points`
+    """
+    store_id = db.info.get("store_id", settings.DEFAULT_STORE_ID)
+    today = datetime.now(UTC).date()
+    version = _data_version(db, today)
+    cached = _forecast_cache.get(store_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    # One computation per store at a time: concurrent misses wait and reuse the result
+    with _forecast_lock(store_id):
+        cached = _forecast_cache.get(store_id)
+        if cached and cached[0] == version:
+            return cached[1]
+        forecast = compute_reorder_points(db, today)
+        _forecast_cache[store_id] = (version, forecast)
+        return forecast
+
+
+def get_reorder_points(db: Session, only_reorder: bool, limit: int) -> dict:
+    """
+    SKUs ordered by days of cover, the ones running out first.
+
+    Args:
+        db: Store-scoped database session
+        only_reorder: Keep only SKUs at or below their reorder point
+        limit: Maximum SKUs to return
+
+    Returns:
+        Dict with the forecast parameters, counts and the selected SKUs
+    """
+    forecast = get_cached_reorder_points(db)
+    needs_reorder = (forecast["avg_daily_demand"] > 0) & (forecast["available"] <= forecast["reorder_point"])
+    candidates = np.flatnonzero(needs_reorder) if only_reorder else np.arange(len(forecast["stock_id"]))
+    order = candidates[np.argsort(forecast["days_of_cover"][candidates], kind="stable")][:limit]
+
+    items = [
+        {
+            "stock_id": int(forecast["stock_id"][i]),
+            "product": forecast["product"][i],
+            "on_hand": int(forecast["on_hand"][i]),
+            "available": int(forecast["available"][i]),
+            "avg_daily_demand": round(float(forecast["avg_daily_demand"][i]), 3),
+            "demand_std": round(float(forecast["demand_std"][i]), 3),
+            "days_of_cover": (
+                round(float(forecast["days_of_cover"][i]), 1)
+                if np.isfinite(forecast["days_of_cover"][i]) else None
+            ),
+            "reorder_point": round(float(forecast["reorder_point"][i]), 1),
+            "suggested_order": int(forecast["suggested_order"][i]),
+        }
+        for i in order
+    ]
+    return {
+        "generated_at": forecast["generated_at"],
+        "window_days": forecast["window_days"],
+        "lead_time_days": forecast["lead_time_days"],
+        "sku_count": len(forecast["stock_id"]),
+        "reorder_count": int(needs_reorder.sum()),
+        "items": items,
+    }
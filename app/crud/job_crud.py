@@ -0,0 +1,90 @@
+import os
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.background.job_runner import submit_job
+from app.config import settings
+from app.models.job import Job
+
+
+def create_job(db: Session, kind: str) -> Job:
+    """
+    Record a job and hand it to the background process pool.
+
+    Args:
+        db: Database session
+        kind: Report to produce
+
+    Returns:
+        Created Job instance, still queued
+
+    Raises:
+        HTTPException: If the job queue is full
+    """
+    job = Job(kind=kind)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    store_id = db.info.get("store_id", settings.DEFAULT_STORE_ID)
+    if not submit_job(store_id, job.id, kind):
+        db.delete(job)
+        db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many jobs queued, please retry later.",
+            headers={"Retry-After": "30"}
+        )
+    return job
+
+
+def get_job(db: Session, job_id: int) -> Job:
+    """
+    Retrieve a job by ID.
+
+    Args:
+        db: Database session
+        job_id: ID of the job
+
+    Returns:
+        Job instance
+
+    Raises:
+        HTTPException: If job not found
+    """
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+def get_job_result_path(db: Session, job_id: int) -> str:
+    """
+    Path of the file produced by a finished job.
+
+    Args:
+        db: Database session
+        job_id: ID of the job
+
+    Returns:
+        Absolute path of the result file
+
+    Raises:
+        HTTPException: If job not found, not finished or its file is gone
+    """
+    job = get_job(db, job_id)
+    if job.status != "done":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status}, no result to download"
+        )
+    if not os.path.exists(job.result_path):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Job result is no longer available"
+        )
+    return job.result_path
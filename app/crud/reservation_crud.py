@@ -0,0 +1,362 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, UTC
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.orm import Session, selectinload
+
+from app.catalogue_cache import bump_catalogue_generation
+from app.config import settings
+from app.models.bill import Bill
+from app.models.billitem import BillItem
+from app.models.reservation import StockReservation
+from app.models.stock import Stock
+from app.models.stock_shard import StockShard
+
+stock_table = Stock.__table__
+
+# One statement per stock row, executed as executemany over all stocks touched
+_release_stmt = (
+    update(stock_table)
+    .where(stock_table.c.id == bindparam("b_stock_id"))
+    .values(reserved_quantity=stock_table.c.reserved_quantity - bindparam("b_held"))
+)
+_convert_stmt = (
+    update(stock_table)
+    .where(stock_table.c.id == bindparam("b_stock_id"))
+    .values(
+        quantity=stock_table.c.quantity - bindparam("b_sold"),
+        reserved_quantity=stock_table.c.reserved_quantity - bindparam("b_held"),
+    )
+)
+
+
+def _release_held(db: Session, held_by_stock: dict[int, int]) -> None:
+    """Give reserved units back to availability."""
+    if held_by_stock:
+        db.connection().execute(
+            _release_stmt,
+            [{"b_stock_id": stock_id, "b_held": held} for stock_id, held in held_by_stock.items()]
+        )
+
+
+def get_open_bill(db: Session, bill_id: int, lock: bool = False) -> Bill:
+    """
+    Fetch a bill that can still take or give back stock.
+
+    Args:
+        db: Database session
+        bill_id: ID of the bill
+        lock: Lock the bill row until the transaction ends
+
+    Returns:
+        Open Bill instance
+
+    Raises:
+        HTTPException: If bill not found or already closed
+    """
+    query = db.query(Bill).filter(Bill.id == bill_id)
+    if lock:
+        query = query.with_for_update()
+    bill = query.first()
+    if not bill:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bill not found"
+        )
+    if bill.status == "Fechado":
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bill is closed"
+        )
+    return bill
+
+
+def create_reservation(
+    db: Session,
+    bill_id: int,
+    stock_id: int,
+    quantity: int,
+    ttl_seconds: int | None = None
+) -> StockReservation:
+    """
+    Hold stock against a bill for a limited time.
+
+    The availability check and the hold are a single conditional UPDATE,
+    so concurrent reservations cannot oversell.
+
+    Args:
+        db: Database session
+        bill_id: ID of the bill
+        stock_id: ID of the stock item
+        quantity: Units to hold
+        ttl_seconds: Hold duration, defaults to RESERVATION_TTL_SECONDS
+
+    Returns:
+        Created StockReservation instance
+
+    Raises:
+        HTTPException: If bill or stock not found, bill is closed, stock is
+            sharded or not enough available stock
+    """
+    get_open_bill(db, bill_id)
+
+    result = db.execute(
+        update(Stock)
+        .where(
+            Stock.id == stock_id,
+            Stock.shard_count == 0,
+            Stock.quantity - Stock.reserved_quantity >= quantity
+        )
+        .values(reserved_quantity=Stock.reserved_quantity + quantity)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        stock = db.execute(
+            select(Stock.shard_count, func.coalesce(Stock.quantity, 0) - Stock.reserved_quantity)
+            .where(Stock.id == stock_id)
+        ).first()
+        db.rollback()
+        if not stock:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Stock item not found"
+            )
+        shard_count, available = stock
+        if shard_count:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Sharded stock items cannot be reserved"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Insufficient stock quantity. Available: {available}, Requested: {quantity}"
+        )
+
+    ttl = ttl_seconds or settings.RESERVATION_TTL_SECONDS
+    reservation = StockReservation(
+        bill_id=bill_id,
+        stock_id=stock_id,
+        quantity=quantity,
+        expires_at=datetime.now(UTC) + timedelta(seconds=ttl)
+    )
+    db.add(reservation)
+    db.commit()
+    bump_catalogue_generation(db)
+    db.refresh(reservation)
+    return reservation
+
+
+def get_bill_reservations(db: Session, bill_id: int) -> list[StockReservation]:
+    """
+    Retrieve the reservations held by a bill.
+
+    Args:
+        db: Database session
+        bill_id: ID of the bill
+
+    Returns:
+        List of StockReservation instances
+    """
+    return db.query(StockReservation).filter(StockReservation.bill_id == bill_id).all()
+
+
+def release_reservation(db: Session, bill_id: int, reservation_id: int) -> None:
+    """
+    Release a reservation before it expires.
+
+    Args:
+        db: Database session
+        bill_id: ID of the bill
+        reservation_id: ID of the reservation
+
+    Raises:
+        HTTPException: If reservation not found
+    """
+    released = db.execute(
+        delete(StockReservation)
+        .where(
+            StockReservation.id == reservation_id,
+            StockReservation.bill_id == bill_id
+        )
+        .returning(StockReservation.stock_id, StockReservation.quantity)
+    ).first()
+    if not released:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reservation not found"
+        )
+
+    _release_held(db, {released.stock_id: released.quantity})
+    db.commit()
+    bump_catalogue_generation(db)
+
+
+def release_bill_reservations(db: Session, bill_id: int) -> None:
+    """
+    Release every reservation of a bill without committing.
+
+    Args:
+        db: Database session
+        bill_id: ID of the bill
+    """
+    held_by_stock: dict[int, int] = defaultdict(int)
+    for stock_id, quantity in db.execute(
+        delete(StockReservation)
+        .where(StockReservation.bill_id == bill_id)
+        .returning(StockReservation.stock_id, StockReservation.quantity)
+    ):
+        held_by_stock[stock_id] += quantity
+    _release_held(db, held_by_stock)
+
+
+def checkout_bill(db: Session, bill_id: int) -> Bill:
+    """
+    Convert the active reservations of a bill into bill items and close it.
+
+    Active holds become BillItems and are decremented from stock; holds that
+    already expired but were not swept yet are only released.
+
+    Args:
+        db: Database session
+        bill_id: ID of the bill
+
+    Returns:
+        Closed Bill instance
+
+    Raises:
+        HTTPException: If bill not found or already closed
+    """
+    # Locked, so two concurrent checkouts cannot both pass the status check
+    bill = get_open_bill(db, bill_id, lock=True)
+
+    now = datetime.now(UTC)
+    # Deleting with RETURNING claims the rows, so a concurrent sweep or
+    # checkout can never release or convert the same hold twice
+    claimed = db.execute(
+        delete(StockReservation)
+        .where(StockReservation.bill_id == bill_id)
+        .returning(StockReservation.stock_id, StockReservation.quantity, StockReservation.expires_at)
+    ).all()
+
+    sold: dict[int, int] = defaultdict(int)
+    held: dict[int, int] = defaultdict(int)
+    for stock_id, quantity, expires_at in claimed:
+        held[stock_id] += quantity
+        if expires_at.tzinfo is None:  # SQLite returns naive UTC datetimes
+            expires_at = expires_at.replace(tzinfo=UTC)
+        if expires_at > now:
+            sold[stock_id] += quantity
+
+    if held:
+        db.connection().execute(
+            _convert_stmt,
+            [
+                {"b_stock_id": stock_id, "b_sold": sold.get(stock_id, 0), "b_held": quantity}
+                for stock_id, quantity in held.items()
+            ]
+        )
+
+    if sold:
+        prices = dict(db.execute(select(Stock.id, Stock.product_price).where(Stock.id.in_(sold))).all())
+        # One executemany; add_all would INSERT ... RETURNING once per item
+        db.execute(
+            insert(BillItem),
+            [
+                {
+                    "bill_id": bill_id,
+                    "stock_id": stock_id,
+                    "quantity": quantity,
+                    "unit_price": prices.get(stock_id) or 0.0,
+                    "store_id": bill.store_id,
+                }
+                for stock_id, quantity in sold.items()
+            ]
+        )
+
+    bill.status = "Fechado"
+    db.commit()
+    if held:
+        bump_catalogue_generation(db)
+    return (
+        db.query(Bill)
+        .options(selectinload(Bill.items).joinedload(BillItem.stock))
+        .filter(Bill.id == bill_id)
+        .one()
+    )
+
+
+def release_expired_reservations(db: Session, batch_size: int) -> int:
+    """
+    Release one batch of expired reservations.
+
+    Uses the `expires_at` index to pick the batch, deletes it with RETURNING
+    and gives the units back with one UPDATE per affected stock.
+
+    Args:
+        db: Database session
+        batch_size: Maximum reservations to release
+
+    Returns:
+        Number of reservations released
+    """
+    expired_ids = (
+        select(StockReservation.id)
+        .where(StockReservation.expires_at <= datetime.now(UTC))
+        .order_by(StockReservation.expires_at)
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    released = db.execute(
+        delete(StockReservation)
+        .where(StockReservation.id.in_(expired_ids))
+        .returning(StockReservation.stock_id, StockReservation.quantity)
+    ).all()
+
+    held_by_stock: dict[int, int] = defaultdict(int)
+    for stock_id, quantity in released:
+        held_by_stock[stock_id] += quantity
+    _release_held(db, held_by_stock)
+    db.commit()
+    if released:
+        bump_catalogue_generation(db)
+    return len(released)
+
+
+def get_stock_availability(db: Session, stock_id: int) -> dict:
+    """
+    On hand, reserved and available quantity of a stock item.
+
+    Reads the `reserved_quantity` counter on the stock row, so it never
+    scans the reservations table. Sharded items sum their shards.
+
+    Args:
+        db: Database session
+        stock_id: ID of the stock item
+
+    Returns:
+        Dict with stock_id, on_hand, reserved and available
+
+    Raises:
+        HTTPException: If stock item not found
+    """
+    row = db.execute(
+        select(Stock.quantity, Stock.reserved_quantity, Stock.shard_count).where(Stock.id == stock_id)
+    ).first()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Stock item not found"
+        )
+    on_hand = row.quantity or 0
+    if row.shard_count:
+        on_hand = db.execute(
+            select(func.coalesce(func.sum(StockShard.quantity), 0)).where(StockShard.stock_id == stock_id)
+        ).scalar_one()
+    return {
+        "stock_id": stock_id,
+        "on_hand": on_hand,
+        "reserved": row.reserved_quantity,
+        "available": on_hand - row.reserved_quantity,
+    }
@@ -2,7 +2,10 @@ from fastapi import HTTPException, status, Depends
 from typing import Annotated
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.catalogue_cache import bump_catalogue_generation, get_catalogue_snapshot
 from app.models.stock import Stock
+from app.models.tombstone import SyncTombstone
+from app.crud.stock_shard_crud import set_sharded_quantity
 from app.schemas.stock_schema import StockCreate, StockUpdate, StockResponse
 
 
@@ -32,6 +35,7 @@ def create_stock(db: Session, stock_data: StockCreate) -> Stock:
     stock = Stock(**stock_data.model_dump())
     db.add(stock)
     db.commit()
+    bump_catalogue_generation(db)
     db.refresh(stock)
     return stock
 
@@ -49,6 +53,53 @@ def get_all_stock(db: Session) -> list[Stock]:
     return db.query(Stock).all()
 
 
+def get_all_stock_json(db: Session) -> bytes | None:
+    """
+    Retrieve all stock items as a JSON array from the shared catalogue cache.
+
+    Args:
+        db: Database session
+
+    Returns:
+        JSON bytes, or None if the cache cannot serve the request (disabled,
+        or being rebuilt by another worker)
+    """
+    snapshot = get_catalogue_snapshot(db)
+    return snapshot.all_json() if snapshot else None
+
+
+def get_stock_fields(
+    db: Session,
+    fields: list[str],
+    stock_id: int | None = None
+) -> list[dict]:
+    """
+    Retrieve stock items selecting only the requested columns.
+
+    Args:
+        db: Database session
+        fields: Column names to select (already validated)
+        stock_id: Restrict the result to a single stock item
+
+    Returns:
+        List of dicts keyed by the requested column names
+
+    Raises:
+        HTTPException: If a single stock item was requested and not found
+    """
+    query = db.query(*[getattr(Stock, field) for field in fields])
+    if stock_id is not None:
+        query = query.filter(Stock.id == stock_id)
+
+    rows = [row._asdict() for row in query.all()]
+    if stock_id is not None and not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Stock item not found"
+        )
+    return rows
+
+
 def get_stock_by_id(db: Session, stock_id: int) -> Stock:
     """
     Retrieve a stock item by ID.
@@ -72,6 +123,49 @@ def get_stock_by_id(db: Session, stock_id: int) -> Stock:
     return stock
 
 
+def get_stock_json(db: Session, stock_id: int) -> bytes | None:
+    """
+    Retrieve a stock item as JSON from the shared catalogue cache.
+
+    Args:
+        db: Database session
+        stock_id: ID of the stock item
+
+    Returns:
+        JSON bytes, or None if the cache cannot serve the request
+
+    Raises:
+        HTTPException: If stock item not found
+    """
+    snapshot = get_catalogue_snapshot(db)
+    if snapshot is None:
+        return None
+    row = snapshot.row_json(stock_id)
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Stock item not found"
+        )
+    return row
+
+
+def get_stocks_by_ids(db: Session, stock_ids: list[int]) -> dict[int, Stock]:
+    """
+    Retrieve several stock items with a single IN query.
+
+    Args:
+        db: Database session
+        stock_ids: IDs of the stock items
+
+    Returns:
+        Mapping of id to Stock for the items that exist
+    """
+    if not stock_ids:
+        return {}
+    stocks = db.query(Stock).filter(Stock.id.in_(stock_ids)).all()
+    return {stock.id: stock for stock in stocks}
+
+
 def update_stock_partial(
     db: Session,
     stock_id: int,
@@ -89,19 +183,24 @@ def update_stock_partial(
         Updated Stock instance
 
     Raises:
-        HTTPException: If stock not found or validation fails
+        HTTPException: If stock not found, validation fails or the new
+            quantity is below the reserved units
     """
-    # Check if stock exists
-    stock = db.query(Stock).filter(Stock.id == stock_id).first()
+    # Convert to dict and filter out unset fields
+    update_data = stock_data.model_dump(exclude_unset=True)
+
+    # Check if stock exists; lock it when the quantity changes so a
+    # concurrent reservation cannot slip under the check below
+    query = db.query(Stock).filter(Stock.id == stock_id)
+    if "quantity" in update_data:
+        query = query.with_for_update()
+    stock = query.first()
     if not stock:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Stock item not found"
         )
 
-    # Convert to dict and filter out unset fields
-    update_data = stock_data.model_dump(exclude_unset=True)
-
     # Validate numeric fields
     if "quantity" in update_data and update_data["quantity"] < 0:
         raise HTTPException(
@@ -119,12 +218,26 @@ def update_stock_partial(
             detail="Purchase price cannot be negative"
         )
 
+    # Reserved units must stay on hand, or availability goes negative
+    reserved = stock.reserved_quantity
+    if "quantity" in update_data and (update_data["quantity"] or 0) < reserved:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Quantity cannot be below the {reserved} reserved units"
+        )
+
+    # Sharded items keep their units in the shards
+    if "quantity" in update_data and stock.shard_count:
+        set_sharded_quantity(db, stock, update_data.pop("quantity"))
+
     # Update stock instance with new values
     for field, value in update_data.items():
         setattr(stock, field, value)
 
     db.add(stock)
     db.commit()
+    bump_catalogue_generation(db)
     db.refresh(stock)
     return stock
 
@@ -148,4 +261,6 @@ def delete_stock(db: Session, stock_id: int) -> None:
         )
 
     db.delete(stock)
-    db.commit()
\ No newline at end of file
+    db.add(SyncTombstone(entity="stock", entity_id=stock_id))
+    db.commit()
+    bump_catalogue_generation(db)
\ No newline at end of file
@@ -0,0 +1,218 @@
+import random
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.catalogue_cache import bump_catalogue_generation
+from app.config import settings
+from app.models.stock import Stock
+from app.models.stock_shard import StockShard
+
+
+def _spread(total: int, shard_count: int) -> list[int]:
+    """Split a quantity as evenly as possible across shards."""
+    base, extra = divmod(total, shard_count)
+    return [base + 1 if shard_no < extra else base for shard_no in range(shard_count)]
+
+
+def _lock_shards(db: Session, stock_id: int) -> list[StockShard]:
+    """Shards of a stock item, locked in shard order so lockers never deadlock."""
+    return list(db.execute(
+        select(StockShard)
+        .where(StockShard.stock_id == stock_id)
+        .order_by(StockShard.shard_no)
+        .with_for_update()
+    ).scalars())
+
+
+def take_from_shards(db: Session, stock_id: int, shard_count: int, quantity: int) -> None:
+    """
+    Remove units from a sharded stock item without committing.
+
+    Tries the shards in random order with a conditional UPDATE each, so
+    concurrent sales usually lock different rows. Only when no single
+    shard holds enough units are all shards locked and drained in order.
+
+    Args:
+        db: Database session
+        stock_id: ID of the stock item
+        shard_count: Number of shards of the item
+        quantity: Units to remove
+
+    Raises:
+        HTTPException: If the shards together hold fewer units than requested
+    """
+    for shard_no in random.sample(range(shard_count), shard_count):
+        result = db.execute(
+            update(StockShard)
+            .where(
+                StockShard.stock_id == stock_id,
+                StockShard.shard_no == shard_no,
+                StockShard.quantity >= quantity
+            )
+            .values(quantity=StockShard.quantity - quantity)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            return
+
+    shards = _lock_shards(db, stock_id)
+    available = sum(shard.quantity for shard in shards)
+    if available < quantity:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Insufficient stock quantity. Available: {available}, Requested: {quantity}"
+        )
+    remaining = quantity
+    for shard in shards:
+        taken = min(shard.quantity, remaining)
+        shard.quantity -= taken
+        remaining -= taken
+        if not remaining:
+            break
+
+
+def set_sharded_quantity(db: Session, stock: Stock, quantity: int) -> None:
+    """
+    Overwrite the on-hand quantity of a sharded stock item without committing.
+
+    Args:
+        db: Database session
+        stock: Sharded Stock instance
+        quantity: New on-hand quantity
+    """
+    for shard, shard_quantity in zip(_lock_shards(db, stock.id), _spread(quantity, stock.shard_count)):
+        shard.quantity = shard_quantity
+    stock.quantity = quantity
+
+
+def get_stock_shards(db: Session, stock_id: int) -> dict:
+    """
+    Shard layout of a stock item.
+
+    Args:
+        db: Database session
+        stock_id: ID of the stock item
+
+    Returns:
+        Dict with stock_id, shard_count, quantity (exact) and the shard quantities
+
+    Raises:
+        HTTPException: If stock item not found
+    """
+    stock = db.query(Stock).filter(Stock.id == stock_id).first()
+    if not stock:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Stock item not found"
+        )
+    shards = list(db.execute(
+        select(StockShard.quantity)
+        .where(StockShard.stock_id == stock_id)
+        .order_by(StockShard.shard_no)
+    ).scalars())
+    return {
+        "stock_id": stock_id,
+        "shard_count": stock.shard_count,
+        "quantity": sum(shards) if stock.shard_count else (stock.quantity or 0),
+        "shards": shards,
+    }
+
+
+def set_stock_sharding(db: Session, stock_id: int, shard_count: int) -> dict:
+    """
+    Split a stock item's quantity across shards, reshard it, or fold the
+    shards back into the stock row (shard_count 0).
+
+    Args:
+        db: Database session
+        stock_id: ID of the stock item
+        shard_count: New number of shards, 0 to disable sharding
+
+    Returns:
+        New shard layout, as returned by `get_stock_shards`
+
+    Raises:
+        HTTPException: If stock item not found, shard_count is out of range
+            or the item has reserved units
+    """
+    if not 0 <= shard_count <= settings.STOCK_SHARD_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"shard_count must be between 0 and {settings.STOCK_SHARD_MAX}"
+        )
+    stock = db.query(Stock).filter(Stock.id == stock_id).with_for_update().first()
+    if not stock:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Stock item not found"
+        )
+    # Shard decrements do not see reservations, so the two cannot be mixed
+    if shard_count and stock.reserved_quantity:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Stock item has reserved units; release them before sharding"
+        )
+
+    if stock.shard_count:
+        total = sum(shard.quantity for shard in _lock_shards(db, stock_id))
+        db.execute(delete(StockShard).where(StockShard.stock_id == stock_id))
+    else:
+        total = stock.quantity or 0
+
+    db.add_all(
+        StockShard(stock_id=stock_id, shard_no=shard_no, quantity=quantity)
+        for shard_no, quantity in enumerate(_spread(total, shard_count) if shard_count else [])
+    )
+    stock.shard_count = shard_count
+    stock.quantity = total
+    db.commit()
+    bump_catalogue_generation(db)
+    return get_stock_shards(db, stock_id)
+
+
+def rebalance_stock_shards(db: Session) -> int:
+    """
+    Even out drained shards and copy every sharded item's total to
+    Stock.quantity, one short transaction per item.
+
+    Shards are only rewritten when the smallest holds less than half of
+    its fair share, so quiet items cost a single read.
+
+    Args:
+        db: Database session (not store-scoped: covers every store of the shard)
+
+    Returns:
+        Number of stock items updated
+    """
+    sharded = db.execute(
+        select(Stock.id, Stock.quantity).where(Stock.shard_count > 0)
+    ).all()
+    db.commit()
+
+    updated = 0
+    for stock_id, cached_total in sharded:
+        shards = _lock_shards(db, stock_id)
+        if not shards:
+            db.commit()
+            continue
+        total = sum(shard.quantity for shard in shards)
+        changed = total != cached_total
+        if min(shard.quantity for shard in shards) * 2 * len(shards) < total:
+            for shard, quantity in zip(shards, _spread(total, len(shards))):
+                shard.quantity = quantity
+            changed = True
+        if total != cached_total:
+            db.execute(
+                update(Stock)
+                .where(Stock.id == stock_id)
+                .values(quantity=total)
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+        updated += changed
+    if updated:
+        bump_catalogue_generation(db)
+    return updated
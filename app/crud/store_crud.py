@@ -0,0 +1,50 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.database import run_on_all_stores
+from app.models.bill import Bill
+from app.models.stock import Stock
+
+
+def get_store_summary(db: Session) -> dict:
+    """
+    Inventory and open bill totals of the session's store.
+
+    Args:
+        db: Store-scoped database session
+
+    Returns:
+        Dict with sku_count, units_on_hand, inventory_value and open_bills
+    """
+    sku_count, units_on_hand, inventory_value = db.execute(
+        select(
+            func.count(Stock.id),
+            func.coalesce(func.sum(Stock.quantity), 0),
+            func.coalesce(func.sum(Stock.quantity * Stock.product_buy), 0.0)
+        )
+    ).one()
+    open_bills = db.execute(
+        select(func.count(Bill.id)).where(Bill.status == "Aberto")
+    ).scalar_one()
+    return {
+        "sku_count": sku_count,
+        "units_on_hand": units_on_hand,
+        "inventory_value": round(inventory_value, 2),
+        "open_bills": open_bills,
+    }
+
+
+def get_all_stores_summary() -> dict:
+    """
+    Fan the store summary out to every store in parallel and add it up.
+
+    Returns:
+        Dict with the summary of each store and the overall total
+    """
+    per_store = run_on_all_stores(get_store_summary)
+    total = {
+        key: sum(summary[key] for summary in per_store.values())
+        for key in ("sku_count", "units_on_hand", "inventory_value", "open_bills")
+    }
+    total["inventory_value"] = round(total["inventory_value"], 2)
+    return {"stores": per_store, "total": total}
@@ -0,0 +1,122 @@
+import base64
+import json
+from datetime import datetime, timedelta, UTC
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, select, true
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.bill import Bill
+from app.models.billitem import BillItem
+from app.models.stock import Stock
+from app.models.tombstone import SyncTombstone
+
+# (rank, entity, time column, id column, data columns). The rank breaks ties
+# between sources with the same timestamp, so (time, rank, id) is a total
+# order and a stable keyset cursor.
+SYNC_SOURCES = [
+    (0, "stock", Stock.updated_at, Stock.id, [
+        Stock.product, Stock.category, Stock.quantity, Stock.reserved_quantity,
+        Stock.product_price, Stock.product_buy,
+    ]),
+    (1, "bill", Bill.updated_at, Bill.id, [
+        Bill.customer_name, Bill.status, Bill.created_at,
+    ]),
+    (2, "bill_item", BillItem.updated_at, BillItem.id, [
+        BillItem.bill_id, BillItem.stock_id, BillItem.quantity,
+        BillItem.unit_price, BillItem.created_at,
+    ]),
+    (3, "tombstone", SyncTombstone.deleted_at, SyncTombstone.id, [
+        SyncTombstone.entity, SyncTombstone.entity_id,
+    ]),
+]
+
+
+def encode_cursor(updated_at: datetime, rank: int, row_id: int) -> str:
+    raw = json.dumps([updated_at.isoformat(), rank, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int, int]:
+    """
+    Decode an opaque sync cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        timestamp, rank, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(timestamp), int(rank), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync cursor"
+        )
+
+
+def _after_cursor(time_column, id_column, rank: int, cursor: tuple[datetime, int, int] | None):
+    """Rows of one source that sort after the cursor in (time, rank, id) order."""
+    if cursor is None:
+        return true()
+    timestamp, cursor_rank, cursor_id = cursor
+    if rank > cursor_rank:
+        return time_column >= timestamp
+    if rank < cursor_rank:
+        return time_column > timestamp
+    return or_(time_column > timestamp, and_(time_column == timestamp, id_column > cursor_id))
+
+
+def get_changes(db: Session, since: str | None, limit: int) -> dict:
+    """
+    Retrieve the rows changed or deleted after a sync cursor.
+
+    Each source is read through its `updated_at` index with a keyset
+    condition, so the cost depends on the number of changes, not on the
+    size of the tables.
+
+    Args:
+        db: Database session
+        since: Cursor returned by the previous call, None for a full sync
+        limit: Maximum changes to return
+
+    Returns:
+        Dict with changes, next_cursor and has_more
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    cursor = decode_cursor(since) if since else None
+    # Hold back the most recent changes: a transaction that stamped an
+    # earlier updated_at may still be committing
+    horizon = datetime.now(UTC) - timedelta(seconds=settings.SYNC_SAFETY_LAG_SECONDS)
+
+    candidates = []
+    for rank, entity, time_column, id_column, columns in SYNC_SOURCES:
+        rows = db.execute(
+            select(id_column, time_column, *columns)
+            .where(
+                _after_cursor(time_column, id_column, rank, cursor),
+                time_column <= horizon
+            )
+            .order_by(time_column, id_column)
+            .limit(limit + 1)
+        ).all()
+        for row in rows:
+            row_id, updated_at, *values = row
+            data = dict(zip((column.key for column in columns), values))
+            if entity == "tombstone":
+                change = {"entity": data["entity"], "op": "delete", "id": data["entity_id"]}
+            else:
+                change = {"entity": entity, "op": "upsert", "id": row_id, "data": data}
+            change["updated_at"] = updated_at
+            candidates.append(((updated_at, rank, row_id), change))
+
+    candidates.sort(key=lambda candidate: candidate[0])
+    page = candidates[:limit]
+    next_cursor = encode_cursor(*page[-1][0]) if page else since or None
+    return {
+        "changes": [change for _, change in page],
+        "next_cursor": next_cursor,
+        "has_more": len(candidates) > limit,
+    }
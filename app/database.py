@@ -1,14 +1,109 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Callable, TypeVar
+
+from fastapi import Header, HTTPException, status
+from sqlalchemy import BIGINT, Integer, String, event
+from sqlalchemy.orm import (
+    Mapped,
+    Session,
+    declarative_base,
+    mapped_column,
+    sessionmaker,
+    with_loader_criteria,
+)
 from app.config import settings
+from app.sharding import ShardRouter
+
+T = TypeVar("T")
 
-engine = create_engine(settings.DATABASE_URL, echo= True)
+# One engine per distinct database in the shard map. SQL logging is
+# controlled by the "sqlalchemy.engine" logger level (SQL_LOG_LEVEL), not by
+# echo, so it goes through the logging queue
+shard_router = ShardRouter(settings.SHARD_MAP, settings.DEFAULT_STORE_ID)
+engine = shard_router.engine_for(settings.DEFAULT_STORE_ID)
 DBBase = declarative_base()
 Sessao_ = sessionmaker(autocommit= False, autoflush= False, bind=engine)
 
+# BIGINT primary keys, as INTEGER on SQLite so they alias the rowid and
+# autoincrement there too
+BigIntPK = BIGINT().with_variant(Integer(), "sqlite")
+
+
+class StoreScoped:
+    """Mixin for rows owned by a store (tenant)."""
+    store_id: Mapped[str] = mapped_column(
+        String(40),
+        nullable=False,
+        default=settings.DEFAULT_STORE_ID,
+        server_default=settings.DEFAULT_STORE_ID
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _scope_to_store(execute_state) -> None:
+    """Restrict ORM selects, updates and deletes to the session's store."""
+    store_id = execute_state.session.info.get("store_id")
+    if store_id is None or execute_state.is_column_load or execute_state.is_relationship_load:
+        return
+    if execute_state.is_select or execute_state.is_update or execute_state.is_delete:
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(
+                StoreScoped,
+                lambda cls: cls.store_id == store_id,
+                include_aliases=True
+            )
+        )
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_store(session: Session, flush_context, instances) -> None:
+    """New rows belong to the store of the session that creates them."""
+    store_id = session.info.get("store_id")
+    if store_id is None:
+        return
+    for obj in session.new:
+        if isinstance(obj, StoreScoped):
+            obj.store_id = store_id
+
+
+def session_for_store(store_id: str) -> Session:
+    """
+    Open a session on the shard of a store, scoped to that store.
+
+    Raises:
+        KeyError: If the store is not in the shard map
+    """
+    return Sessao_(bind=shard_router.engine_for(store_id), info={"store_id": store_id})
+
+
+def run_on_all_stores(fn: Callable[[Session], T]) -> dict[str, T]:
+    """
+    Run `fn` once per store, in parallel, each with its own scoped session.
+
+    Returns:
+        Mapping of store id to the result of `fn`
+    """
+    def run(store_id: str) -> T:
+        db = session_for_store(store_id)
+        try:
+            return fn(db)
+        finally:
+            db.close()
+
+    stores = shard_router.stores
+    with ThreadPoolExecutor(max_workers=len(stores)) as executor:
+        return dict(zip(stores, executor.map(run, stores)))
+
+
 #Depends
-def get_db():
-    db = Sessao_()
+def get_db(x_store_id: Annotated[str | None, Header()] = None):
+    store_id = x_store_id or settings.DEFAULT_STORE_ID
+    if not shard_router.has_store(store_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Store not found"
+        )
+    db = session_for_store(store_id)
     try:
         yield db
     finally:
@@ -0,0 +1,144 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+from contextvars import ContextVar
+from datetime import datetime, UTC
+from logging.handlers import QueueHandler, QueueListener
+
+from app.config import settings
+
+# Correlation id of the request being handled, set by RequestContextMiddleware
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+_listener: QueueListener | None = None
+_queue_handler: QueueHandler | None = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id on the calling thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of the records of a noisy logger."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return self.rate >= 1.0 or random.random() < self.rate
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    Only the message and traceback are rendered before enqueueing, since
+    the args and exc_info may not be safe to use from another thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        payload.update(
+            (key, value) for key, value in vars(record).items()
+            if key not in _RECORD_ATTRS
+        )
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+def _set_sampling(logger_name: str, rate: float) -> None:
+    """Install the sampling filter of a logger, replacing any earlier one."""
+    logger = logging.getLogger(logger_name)
+    for sampling_filter in [f for f in logger.filters if isinstance(f, SamplingFilter)]:
+        logger.removeFilter(sampling_filter)
+    logger.addFilter(SamplingFilter(rate))
+
+
+def setup_logging() -> QueueListener:
+    """
+    Route all logging through a queue drained by a background thread.
+
+    Request threads only enqueue records; formatting and the blocking write
+    to stderr happen on the listener thread. Safe to call more than once.
+
+    Returns:
+        The running QueueListener
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return _listener
+
+    stream_handler = logging.StreamHandler()
+    if settings.LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+        ))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = DeferredQueueHandler(log_queue)
+    _queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers = [_queue_handler]
+    root.setLevel(settings.LOG_LEVEL)
+
+    # SQL statements are only logged when explicitly enabled by level
+    logging.getLogger("sqlalchemy.engine").setLevel(settings.SQL_LOG_LEVEL)
+
+    _set_sampling("app.access", settings.LOG_ACCESS_SAMPLE_RATE)
+    _set_sampling("app.health", settings.LOG_HEALTH_SAMPLE_RATE)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging() -> None:
+    """
+    Flush pending records, stop the listener thread and detach the queue
+    handler, so later records are not queued with nobody draining them.
+    """
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,27 +1,46 @@
+import asyncio
 import logging
 import os
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # brotli-asgi is optional, fall back to GZip only
+    BrotliMiddleware = None
+
 from app.routers.stock_routes import router as stock_router
 from app.routers.bill_router import router as bill_router
 from app.routers.billitem_router import router as billitem_router
-from app.database import engine, DBBase
+from app.routers.metrics_router import router as metrics_router
+from app.routers.reservation_router import router as reservation_router
+from app.routers.analytics_router import router as analytics_router
+from app.routers.sync_router import router as sync_router
+from app.routers.job_router import router as job_router
+from app.routers.batch_router import router as batch_router
+from app.background.reservation_sweeper import run_reservation_sweeper
+from app.background.job_monitor import run_job_monitor
+from app.background.job_runner import shutdown_job_runner
+from app.background.shard_rebalancer import run_shard_rebalancer
+from app.middleware.admission import AdmissionControlMiddleware, admission_controller
+from app.middleware.query_budget import QueryBudgetMiddleware
+from app.middleware.request_context import RequestContextMiddleware
+from app.database import DBBase, shard_router
 from app.models import all_models
 from app.config import settings
+from app.logging_config import request_id_var, setup_logging, stop_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Configure logging: records are queued and written by a background thread
+setup_logging()
 logger = logging.getLogger(__name__)
 
-# Create tables once, after all models are imported
+# Create tables once per shard database, after all models are imported
 logger.info("Initializing database tables...")
-DBBase.metadata.create_all(bind=engine)
+for shard_engine in shard_router.engines():
+    DBBase.metadata.create_all(bind=shard_engine)
 logger.info("Database tables initialized successfully")
 
 # Get allowed origins from environment variable
@@ -34,9 +53,18 @@ ALLOWED_ORIGINS = os.getenv(
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage app startup and shutdown events"""
+    setup_logging()
     logger.info("Application starting up...")
+    sweeper = asyncio.create_task(run_reservation_sweeper())
+    rebalancer = asyncio.create_task(run_shard_rebalancer())
+    job_monitor = asyncio.create_task(run_job_monitor())
     yield
     logger.info("Application shutting down...")
+    sweeper.cancel()
+    rebalancer.cancel()
+    job_monitor.cancel()
+    shutdown_job_runner()
+    stop_logging()
 
 app = FastAPI(
     title="Sistema de Estoque e Comandas",
@@ -45,6 +73,17 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Limit concurrent requests per route class so spikes queue (bounded) in
+# front of the DB pool instead of piling up on it; health checks bypass it
+app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+
+# Count the SQL statements of each request and report N+1 patterns
+if settings.QUERY_BUDGET_MODE != "off":
+    app.add_middleware(QueryBudgetMiddleware)
+
+# Correlation id and access log for every request (including rejected ones)
+app.add_middleware(RequestContextMiddleware)
+
 # Add CORS middleware for cross-origin requests
 app.add_middleware(
     CORSMiddleware,
@@ -54,13 +93,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (stock/bill listings). Brotli is preferred when the
+# client accepts it, with GZip as fallback; small bodies are sent as-is.
+if BrotliMiddleware is not None:
+    app.add_middleware(
+        BrotliMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_fallback=True
+    )
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
 # Add exception handler for general errors
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
+    # Runs outside RequestContextMiddleware, so the id comes from the scope
+    request_id = getattr(request.state, "request_id", None)
+    token = request_id_var.set(request_id)
+    try:
+        logger.error("Unhandled exception: %s", exc, exc_info=True)
+    finally:
+        request_id_var.reset(token)
     return JSONResponse(
         status_code=500,
-        content={"detail": "An unexpected error occurred. Please try again later."}
+        content={"detail": "An unexpected error occurred. Please try again later."},
+        headers={"X-Request-ID": request_id} if request_id else None
     )
 
 # Register routers
@@ -70,13 +127,18 @@ app.include_router(bill_router, prefix="/api/v1")
 # Mount bill-item routes under the bills path so endpoints look like:
 # /api/v1/bills/{bill_id}/items
 app.include_router(billitem_router, prefix="/api/v1/bills")
+app.include_router(reservation_router, prefix="/api/v1/bills")
+app.include_router(metrics_router, prefix="/api/v1")
+app.include_router(analytics_router, prefix="/api/v1")
+app.include_router(sync_router, prefix="/api/v1")
+app.include_router(job_router, prefix="/api/v1")
+app.include_router(batch_router, prefix="/api/v1")
 logger.info("Routers registered successfully")
 
 
 @app.get("/", tags=["Health"])
 def root():
     """Health check endpoint to verify API is running"""
-    logger.info("Health check endpoint accessed")
     return {
         "message": "API funcionando corretamente!",
         "version": "2.0.0",
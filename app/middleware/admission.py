@@ -0,0 +1,170 @@
+import asyncio
+import math
+from dataclasses import dataclass, field
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+
+# Endpoints that must answer even when the API is saturated
+BYPASS_PATHS = {"/", "/api/v1/health"}
+BYPASS_PREFIXES = ("/api/v1/metrics", "/docs", "/redoc", "/openapi.json")
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+# POST endpoints that only read and share the reads budget
+READ_ONLY_POSTS = {"/api/v1/batch"}
+
+
+@dataclass
+class RouteClassLimiter:
+    """Concurrency limit with a bounded, deadline-based wait queue."""
+    name: str
+    concurrency: int
+    queue_size: int
+    queue_timeout: float
+    active: int = 0
+    waiting: int = 0
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    _semaphore: asyncio.Semaphore = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def acquire(self) -> bool:
+        """
+        Take a slot, waiting in the queue if every slot is busy.
+
+        Returns:
+            True when admitted, False when the queue is full or the
+            deadline expired while waiting
+        """
+        if self._semaphore.locked():
+            if self.waiting >= self.queue_size:
+                self.rejected += 1
+                return False
+
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        """Give the slot back to the next queued request."""
+        self.active -= 1
+        self._semaphore.release()
+
+    def snapshot(self) -> dict:
+        """Current queue depth and counters for the metrics endpoint."""
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "queue_timeout": self.queue_timeout,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+class AdmissionController:
+    """Maps requests to route classes, each with its own limiter."""
+
+    def __init__(self, analytics_prefixes: tuple[str, ...] = ()) -> None:
+        self.analytics_prefixes = analytics_prefixes
+        self.limiters = {
+            "writes": RouteClassLimiter(
+                "writes",
+                settings.ADMISSION_WRITE_CONCURRENCY,
+                settings.ADMISSION_WRITE_QUEUE,
+                settings.ADMISSION_QUEUE_TIMEOUT,
+            ),
+            "reads": RouteClassLimiter(
+                "reads",
+                settings.ADMISSION_READ_CONCURRENCY,
+                settings.ADMISSION_READ_QUEUE,
+                settings.ADMISSION_QUEUE_TIMEOUT,
+            ),
+            "analytics": RouteClassLimiter(
+                "analytics",
+                settings.ADMISSION_ANALYTICS_CONCURRENCY,
+                settings.ADMISSION_ANALYTICS_QUEUE,
+                settings.ADMISSION_QUEUE_TIMEOUT,
+            ),
+        }
+
+    def classify(self, method: str, path: str) -> str | None:
+        """
+        Return the route class of a request, or None if it bypasses limits.
+
+        Args:
+            method: HTTP method
+            path: Request path
+        """
+        if path in BYPASS_PATHS or path.startswith(BYPASS_PREFIXES):
+            return None
+        if path.startswith(self.analytics_prefixes):
+            return "analytics"
+        if method in READ_METHODS or path in READ_ONLY_POSTS:
+            return "reads"
+        return "writes"
+
+    def snapshot(self) -> dict:
+        return {name: limiter.snapshot() for name, limiter in self.limiters.items()}
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that sheds load before requests reach the DB pool.
+
+    Requests that cannot get a slot within the queue deadline, or arrive
+    when the queue is already full, get an immediate 503 with Retry-After.
+    """
+
+    def __init__(self, app, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+        self.retry_after = str(max(1, math.ceil(settings.ADMISSION_QUEUE_TIMEOUT)))
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.controller.classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.controller.limiters[route_class]
+        if not await limiter.acquire():
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Server is busy, please retry shortly."},
+                headers={"Retry-After": self.retry_after},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+admission_controller = AdmissionController(
+    analytics_prefixes=tuple(settings.ADMISSION_ANALYTICS_PREFIXES)
+)
@@ -0,0 +1,81 @@
+import json
+import logging
+
+from app.config import settings
+from app.query_budget import QueryBudget, QueryBudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the SQL statements of every request, response serialization
+    included, and report requests over their budget.
+
+    The budget starts at QUERY_BUDGET_MAX_QUERIES / QUERY_BUDGET_MAX_REPEATS
+    and can be changed per route with `query_budget_limit`. Installed only
+    when QUERY_BUDGET_MODE is not `off`.
+
+    In `raise` mode the response is held until its last chunk, so a request
+    over budget is answered with a 500 carrying the report instead of its
+    normal response; any HTTP client, tests included, sees the failure.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = QueryBudget(
+            max_queries=settings.QUERY_BUDGET_MAX_QUERIES,
+            max_repeats=settings.QUERY_BUDGET_MAX_REPEATS,
+            label=f"{scope['method']} {scope['path']}"
+        )
+        if budget.mode != "raise":
+            with budget:
+                await self.app(scope, receive, send)
+            return
+
+        held: list[dict] = []
+        rejected = False
+
+        async def send_checked(message) -> None:
+            nonlocal rejected
+            if message["type"] == "http.response.start" or message.get("more_body"):
+                held.append(message)
+                return
+            if message["type"] == "http.response.body":
+                report = budget.report()
+                if report is not None:
+                    rejected = True
+                    logger.error(report, extra={"query_count": budget.count})
+                    await self._send_report(send, report)
+                    return
+            for held_message in held:
+                await send(held_message)
+            held.clear()
+            await send(message)
+
+        try:
+            with budget:
+                await self.app(scope, receive, send_checked)
+        except QueryBudgetExceeded:
+            # Already answered with the report
+            if not rejected:
+                raise
+
+    @staticmethod
+    async def _send_report(send, report: str) -> None:
+        body = json.dumps({"detail": report}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 500,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,71 @@
+import logging
+import time
+import uuid
+
+from app.logging_config import request_id_var
+from app.middleware.admission import BYPASS_PATHS
+
+access_logger = logging.getLogger("app.access")
+health_logger = logging.getLogger("app.health")
+
+
+class RequestContextMiddleware:
+    """
+    Assign a correlation id to every request and emit one access log line.
+
+    The id is taken from the `X-Request-ID` header when the client sends
+    one, exposed to log records through `request_id_var` and to the
+    global exception handler through `request.state.request_id`, and
+    echoed back in the response headers.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1") or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        # The global exception handler runs outside this middleware, after
+        # the contextvar is reset; it reads the id from request.state
+        scope.setdefault("state", {})["request_id"] = request_id
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_request_id(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"].append((b"x-request-id", request_id.encode("latin-1")))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except Exception:
+            self._log(scope, 500, start)
+            raise
+        else:
+            self._log(scope, status_code, start)
+        finally:
+            request_id_var.reset(token)
+
+    @staticmethod
+    def _log(scope, status_code: int, start: float) -> None:
+        logger = health_logger if scope["path"] in BYPASS_PATHS else access_logger
+        logger.info(
+            "%s %s %s",
+            scope["method"],
+            scope["path"],
+            status_code,
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            },
+        )
@@ -1,5 +1,9 @@
 # Import all models to ensure they are registered with the database
 from app.models import stock
+from app.models import stock_shard
 from app.models import bill
 from app.models import billitem
-from app.models import user
\ No newline at end of file
+from app.models import user
+from app.models import reservation
+from app.models import tombstone
+from app.models import job
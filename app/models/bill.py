@@ -1,24 +1,33 @@
-from app.database import DBBase
+from app.database import DBBase, BigIntPK, StoreScoped
 from datetime import datetime, UTC
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, BIGINT, DateTime
+from sqlalchemy import String, DateTime, UniqueConstraint
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from app.models.billitem import BillItem
 
 
-class Bill(DBBase):
+class Bill(StoreScoped, DBBase):
     __tablename__ = "bill"
+    # Customer names are unique per store
+    __table_args__ = (UniqueConstraint("store_id", "customer_name"),)
 
-    id: Mapped[int] = mapped_column(BIGINT, primary_key=True, index=True)
-    customer_name: Mapped[str] = mapped_column(String(70), unique=True, nullable=True)
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True, index=True)
+    customer_name: Mapped[str] = mapped_column(String(70), nullable=True)
     status: Mapped[str] = mapped_column(String(40), default="Aberto")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(UTC)
     )
+    # Bumped on every change; drives the delta-sync endpoint
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
+        index=True
+    )
 
-    # Relationship to BillItem
-    items: Mapped[list["BillItem"]] = relationship(back_populates="bill")
+    # Relationship to BillItem; items go with the bill
+    items: Mapped[list["BillItem"]] = relationship(back_populates="bill", cascade="all, delete-orphan")
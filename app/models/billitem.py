@@ -1,8 +1,8 @@
-from app.database import DBBase
+from app.database import DBBase, BigIntPK, StoreScoped
 from datetime import datetime, UTC
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import BIGINT, DateTime, ForeignKey
+from sqlalchemy import DateTime, ForeignKey
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -10,11 +10,11 @@ if TYPE_CHECKING:
     from app.models.stock import Stock
 
 
-class BillItem(DBBase):
+class BillItem(StoreScoped, DBBase):
     __tablename__ = "bill_item"
 
-    id: Mapped[int] = mapped_column(BIGINT, primary_key=True, index=True)
-    bill_id: Mapped[int] = mapped_column(ForeignKey("bill.id"), nullable=False)
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True, index=True)
+    bill_id: Mapped[int] = mapped_column(ForeignKey("bill.id"), nullable=False, index=True)
     stock_id: Mapped[int] = mapped_column(ForeignKey("stock.id"), nullable=False)
     quantity: Mapped[int] = mapped_column(nullable=False)
     unit_price: Mapped[float] = mapped_column(nullable=False)
@@ -22,6 +22,13 @@ class BillItem(DBBase):
         DateTime(timezone=True),
         default=lambda: datetime.now(UTC)
     )
+    # Bumped on every change; drives the delta-sync endpoint
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
+        index=True
+    )
 
     # Relationships
     bill: Mapped["Bill"] = relationship(back_populates="items")
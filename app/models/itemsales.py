@@ -1,7 +1,7 @@
-from app.database import DBBase
+from app.database import DBBase, BigIntPK
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Float, String, ForeignKey, BIGINT
+from sqlalchemy import Float, String, ForeignKey
 
 from typing import List
 
@@ -10,7 +10,7 @@ from app.models.stock import Stock
 class SaleItem(DBBase):
   __tablename__ = "saleitems"
 
-  id: Mapped[int] = mapped_column(BIGINT, primary_key=True, index=True)
+  id: Mapped[int] = mapped_column(BigIntPK, primary_key=True, index=True)
   sale_id: Mapped[int] = mapped_column(ForeignKey("sales.id", ondelete="CASCADE"), nullable=True)
   stock_id: Mapped[int] = mapped_column(ForeignKey("stock.id", ondelete="CASCADE"),nullable=True)
 
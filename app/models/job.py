@@ -0,0 +1,27 @@
+from app.database import DBBase, BigIntPK, StoreScoped
+from datetime import datetime, UTC
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, String, Text
+
+
+class Job(StoreScoped, DBBase):
+    """Export or report run in the background job pool."""
+    __tablename__ = "job"
+
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True, index=True)
+    kind: Mapped[str] = mapped_column(String(40), nullable=False)
+    # queued -> running -> done | failed
+    status: Mapped[str] = mapped_column(String(20), default="queued")
+    result_path: Mapped[str] = mapped_column(String(255), nullable=True)
+    result_rows: Mapped[int] = mapped_column(nullable=True)
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC)
+    )
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Refreshed by the API process that submitted the job while it is queued
+    # or running; a stale heartbeat means that process is gone
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
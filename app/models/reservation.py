@@ -0,0 +1,30 @@
+from app.database import DBBase, BigIntPK, StoreScoped
+from datetime import datetime, UTC
+
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DateTime, ForeignKey
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.models.bill import Bill
+    from app.models.stock import Stock
+
+
+class StockReservation(StoreScoped, DBBase):
+    """Stock held against an open bill until checkout or expiry."""
+    __tablename__ = "stock_reservation"
+
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True, index=True)
+    bill_id: Mapped[int] = mapped_column(ForeignKey("bill.id"), nullable=False, index=True)
+    stock_id: Mapped[int] = mapped_column(ForeignKey("stock.id"), nullable=False)
+    quantity: Mapped[int] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC)
+    )
+    # Indexed so the sweeper finds expired holds without a full scan
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    # Relationships
+    bill: Mapped["Bill"] = relationship()
+    stock: Mapped["Stock"] = relationship()
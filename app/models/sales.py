@@ -1,7 +1,7 @@
-from app.database import DBBase
+from app.database import DBBase, BigIntPK
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, BIGINT, ForeignKey, Float, DateTime
+from sqlalchemy import String, ForeignKey, Float, DateTime
 from sqlalchemy.sql import func
 
 from typing import List
@@ -12,7 +12,7 @@ from app.models.itemsales import SaleItem
 class Sales(DBBase):
   __tablename__ = "sales"
 
-  id: Mapped[int] = mapped_column(BIGINT, primary_key=True, index=True)
+  id: Mapped[int] = mapped_column(BigIntPK, primary_key=True, index=True)
   user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=True)
   total: Mapped[float] = mapped_column(Float, nullable=True)
   created_at: Mapped[str] = mapped_column(DateTime(timezone=True),server_default=func.now())
@@ -1,29 +1,45 @@
-from app.database import DBBase
+from app.database import DBBase, BigIntPK, StoreScoped
 from datetime import datetime, UTC
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import BIGINT, String, Float, DateTime, ForeignKey
+from sqlalchemy import String, Float, DateTime, ForeignKey, UniqueConstraint
 from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from app.models.billitem import BillItem
+    from app.models.stock_shard import StockShard
     from app.models.user import User
 
 
-class Stock(DBBase):
+class Stock(StoreScoped, DBBase):
     __tablename__ = "stock"
+    # Product names are unique per store
+    __table_args__ = (UniqueConstraint("store_id", "product"),)
 
-    id: Mapped[int] = mapped_column(BIGINT, primary_key=True, index=True)
-    product: Mapped[str] = mapped_column(String(60), unique=True, nullable=True)
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True, index=True)
+    product: Mapped[str] = mapped_column(String(60), nullable=True)
     category: Mapped[str] = mapped_column(String(80))
     quantity: Mapped[int] = mapped_column(nullable=True, default=1)
+    # Units held by active reservations; available = quantity - reserved_quantity
+    reserved_quantity: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")
+    # Hot SKUs keep their units in `shard_count` StockShard rows; `quantity`
+    # is then their total as of the last rebalance
+    shard_count: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")
     product_price: Mapped[float] = mapped_column(Float, nullable=True)
     product_buy: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(UTC)
     )
+    # Bumped on every change; drives the delta-sync endpoint
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
+        index=True
+    )
     created_by: Mapped[Optional[str]] = mapped_column(ForeignKey("user.username"), nullable=True)
 
     # Relationships
     bill_items: Mapped[list["BillItem"]] = relationship(back_populates="stock")
+    shards: Mapped[list["StockShard"]] = relationship(cascade="all, delete-orphan")
@@ -0,0 +1,20 @@
+from app.database import DBBase, BigIntPK, StoreScoped
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, UniqueConstraint
+
+
+class StockShard(StoreScoped, DBBase):
+    """
+    One sub-counter of a hot stock item's on-hand quantity.
+
+    Sales take units from a random shard, so concurrent sales of the same
+    product lock different rows instead of queueing on the stock row.
+    """
+    __tablename__ = "stock_shard"
+    __table_args__ = (UniqueConstraint("stock_id", "shard_no"),)
+
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True, index=True)
+    stock_id: Mapped[int] = mapped_column(ForeignKey("stock.id"), nullable=False, index=True)
+    shard_no: Mapped[int] = mapped_column(nullable=False)
+    quantity: Mapped[int] = mapped_column(nullable=False, default=0)
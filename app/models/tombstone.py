@@ -0,0 +1,19 @@
+from app.database import DBBase, BigIntPK, StoreScoped
+from datetime import datetime, UTC
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BIGINT, String, DateTime
+
+
+class SyncTombstone(StoreScoped, DBBase):
+    """Record of a deleted row, so offline clients can drop it on resync."""
+    __tablename__ = "sync_tombstone"
+
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True, index=True)
+    entity: Mapped[str] = mapped_column(String(40), nullable=False)
+    entity_id: Mapped[int] = mapped_column(BIGINT, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        index=True
+    )
@@ -0,0 +1,201 @@
+"""
+Query budgets: count the SQL statements a block of code runs and flag
+N+1 patterns.
+
+A `QueryBudget` records every statement executed in its context, on any
+engine, with the lazy-loaded relationship that triggered it (e.g.
+`BillItem.stock`). On exit it is checked against `max_queries` and
+`max_repeats` (how often the same SQL text may run); violations are logged
+or raised depending on QUERY_BUDGET_MODE:
+
+    with QueryBudget(max_queries=3):
+        get_bill_by_id(db, bill_id)
+
+    @QueryBudget(max_repeats=1)
+    def build_report(db): ...
+
+Every HTTP request gets a budget from QueryBudgetMiddleware; routes declare
+their own limits with `dependencies=[query_budget_limit(max_queries=...)]`.
+"""
+import functools
+import inspect
+import logging
+from collections import Counter
+from contextvars import ContextVar
+
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Budgets open in the current context, innermost last
+_active_budgets: ContextVar[tuple["QueryBudget", ...]] = ContextVar("query_budgets", default=())
+
+# Statements quoted in a report, and how much of each
+_REPORT_STATEMENTS = 5
+_REPORT_SQL_CHARS = 300
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a budget is exceeded and QUERY_BUDGET_MODE is `raise`."""
+
+
+class QueryBudget:
+    """
+    Statement counter usable as a context manager or decorator.
+
+    Args:
+        max_queries: Statements allowed in total, None for no limit
+        max_repeats: Times the same SQL text may run, None for no limit
+        label: Name used in the report, defaults to the decorated function
+        mode: `warn`, `raise` or `off`, defaults to QUERY_BUDGET_MODE
+    """
+
+    def __init__(
+        self,
+        max_queries: int | None = None,
+        max_repeats: int | None = None,
+        label: str | None = None,
+        mode: str | None = None
+    ) -> None:
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.label = label
+        self.mode = mode or settings.QUERY_BUDGET_MODE
+        # (SQL text, lazy relationship that fired it or None)
+        self.statements: list[tuple[str, str | None]] = []
+        self._token = None
+
+    def __enter__(self) -> "QueryBudget":
+        self.statements = []
+        self._token = _active_budgets.set(_active_budgets.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _active_budgets.reset(self._token)
+        # An exception already on its way out says more than the budget
+        if exc_type is None:
+            self.enforce()
+
+    def __call__(self, fn):
+        label = self.label or fn.__qualname__
+
+        def fresh() -> "QueryBudget":
+            # A new budget per call, so concurrent calls do not share counts
+            return QueryBudget(self.max_queries, self.max_repeats, label, self.mode)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with fresh():
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with fresh():
+                return fn(*args, **kwargs)
+        return wrapper
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self) -> list[tuple[str, int, list[str]]]:
+        """
+        Statements run more often than `max_repeats`, most frequent first.
+
+        Returns:
+            (SQL text, times run, lazy relationships that fired it)
+        """
+        if self.max_repeats is None:
+            return []
+        counts = Counter(sql for sql, _ in self.statements)
+        return [
+            (sql, times, sorted({lazy for text, lazy in self.statements if text == sql and lazy}))
+            for sql, times in counts.most_common()
+            if times > self.max_repeats
+        ]
+
+    def violations(self) -> list[str]:
+        """Human readable description of every exceeded limit."""
+        problems = []
+        if self.max_queries is not None and self.count > self.max_queries:
+            problems.append(f"{self.count} statements, budget is {self.max_queries}")
+        for sql, times, lazy in self.repeated()[:_REPORT_STATEMENTS]:
+            source = f" (lazy load of {', '.join(lazy)})" if lazy else ""
+            problems.append(f"ran {times}x{source}: {sql[:_REPORT_SQL_CHARS]}")
+        lazy_loads = Counter(lazy for _, lazy in self.statements if lazy)
+        if problems and lazy_loads:
+            problems.append("lazy loads: " + ", ".join(f"{name} x{times}" for name, times in lazy_loads.most_common()))
+        return problems
+
+    def report(self) -> str | None:
+        """Violation report, or None if the budget was respected."""
+        problems = self.violations()
+        if not problems:
+            return None
+        return f"Query budget exceeded in {self.label or 'block'}:\n  " + "\n  ".join(problems)
+
+    def enforce(self) -> None:
+        """Log or raise the violations, according to the mode."""
+        if self.mode == "off":
+            return
+        report = self.report()
+        if report is None:
+            return
+        if self.mode == "raise":
+            raise QueryBudgetExceeded(report)
+        logger.warning(report, extra={"query_count": self.count})
+
+
+def current_query_budget() -> QueryBudget | None:
+    """Innermost budget open in this context, if any."""
+    budgets = _active_budgets.get()
+    return budgets[-1] if budgets else None
+
+
+def query_budget_limit(max_queries: int | None = None, max_repeats: int | None = None):
+    """
+    Route dependency declaring the budget of an endpoint, e.g.
+    `@router.get("", dependencies=[query_budget_limit(max_queries=4)])`.
+
+    It overrides the defaults of the request budget opened by
+    QueryBudgetMiddleware; limits left as None keep the defaults.
+    """
+    def set_limits() -> None:
+        budget = current_query_budget()
+        if budget is None:
+            return
+        if max_queries is not None:
+            budget.max_queries = max_queries
+        if max_repeats is not None:
+            budget.max_repeats = max_repeats
+    return Depends(set_limits)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _tag_lazy_load(execute_state) -> None:
+    """Mark statements emitted by a lazy load with the relationship loaded."""
+    if (
+        _active_budgets.get()
+        and execute_state.is_relationship_load
+        and execute_state.lazy_loaded_from is not None
+    ):
+        execute_state.update_execution_options(
+            query_budget_lazy=str(execute_state.loader_strategy_path.prop)
+        )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    budgets = _active_budgets.get()
+    if not budgets:
+        return
+    lazy = context.execution_options.get("query_budget_lazy") if context is not None else None
+    for budget in budgets:
+        budget.statements.append((statement, lazy))
@@ -0,0 +1,46 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.forecast_schema import ReorderPointsResponse
+from app.schemas.store_schema import StoresSummaryResponse
+from app.crud.forecast_crud import get_reorder_points
+from app.crud.store_crud import get_all_stores_summary
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/stores", response_model=StoresSummaryResponse)
+def stores_summary() -> StoresSummaryResponse:
+    """
+    Inventory and open bill totals for every store, queried across shards.
+
+    Returns:
+        Per-store summaries and the overall total
+    """
+    return get_all_stores_summary()
+
+
+@router.get("/reorder-points", response_model=ReorderPointsResponse)
+def reorder_points(
+    db: Annotated[Session, Depends(get_db)],
+    only_reorder: Annotated[bool, Query(description="Only SKUs at or below their reorder point")] = True,
+    limit: Annotated[int, Query(ge=1, le=10000)] = 100
+) -> ReorderPointsResponse:
+    """
+    Demand forecast and reorder points of the store's SKUs.
+
+    The forecast covers the whole catalogue and is cached until new sales
+    or stock changes arrive.
+
+    Args:
+        db: Database session
+        only_reorder: Only return SKUs that need restocking
+        limit: Maximum SKUs to return
+
+    Returns:
+        SKUs ordered by days of cover, lowest first
+    """
+    return get_reorder_points(db=db, only_reorder=only_reorder, limit=limit)
@@ -0,0 +1,36 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.query_budget import query_budget_limit
+from app.schemas.batch_schema import BatchRequest, BatchResponse
+from app.crud.batch_crud import resolve_batch
+
+router = APIRouter(prefix="/batch", tags=["Batch"])
+
+
+@router.post(
+    "",
+    response_model=BatchResponse,
+    dependencies=[query_budget_limit(max_queries=4, max_repeats=1)]
+)
+def batch_read(
+    batch: BatchRequest,
+    db: Annotated[Session, Depends(get_db)]
+) -> BatchResponse:
+    """
+    Read several stock items and bills in a single request.
+
+    Each entry carries its own status, so unknown ids come back as 404
+    entries while the rest of the batch succeeds.
+
+    Args:
+        batch: Stock and bill ids to read
+        db: Database session
+
+    Returns:
+        Stock and bill entries in the order requested
+    """
+    return resolve_batch(db=db, stock_ids=batch.stocks, bill_ids=batch.bills)
@@ -1,13 +1,25 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.schemas.bill_schema import BillCreate, BillResponse, BillUpdate
+from app.query_budget import query_budget_limit
+from app.schemas.bill_schema import (
+    BILL_FIELDS,
+    BILL_INCLUDES,
+    BillCreate,
+    BillResponse,
+    BillUpdate
+)
+from app.crud.fieldsets import parse_fieldset, parse_include
+from app.crud.reservation_crud import checkout_bill
 from app.crud.bill_crud import (
     create_bill,
     get_all_bills,
+    get_bill_fields,
     get_bill_by_id,
     update_bill,
     delete_bill
@@ -15,6 +27,36 @@ from app.crud.bill_crud import (
 
 router = APIRouter(prefix="/bills", tags=["Bills"])
 
+FieldsQuery = Annotated[
+    str | None,
+    Query(description="Comma separated list of bill fields to return, e.g. `id,customer_name,status`")
+]
+IncludeQuery = Annotated[
+    str | None,
+    Query(description="Set to `items` to embed bill items when a fieldset is requested")
+]
+
+
+def _parse_sparse_query(fields: str | None, include: str | None) -> tuple[list[str] | None, set[str]]:
+    """
+    Parse `fields` and `include` together.
+
+    The full bill always embeds its items, so `include` only means
+    something next to a fieldset and is rejected on its own.
+
+    Raises:
+        HTTPException: If a field or include is unknown, or `include` is
+            used without `fields`
+    """
+    fieldset = parse_fieldset(fields, BILL_FIELDS)
+    embed = parse_include(include, BILL_INCLUDES)
+    if fieldset is None and embed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="include requires fields; the full bill already embeds its items"
+        )
+    return fieldset, embed
+
 
 @router.post("", response_model=BillResponse, status_code=status.HTTP_201_CREATED)
 def create_bill_endpoint(
@@ -35,38 +77,79 @@ def create_bill_endpoint(
 
 
 @router.get("", response_model=list[BillResponse])
-def list_all_bills(db: Annotated[Session, Depends(get_db)]) -> list[BillResponse]:
+def list_all_bills(
+    db: Annotated[Session, Depends(get_db)],
+    fields: FieldsQuery = None,
+    include: IncludeQuery = None
+) -> list[BillResponse]:
     """
     Retrieve all bills.
 
+    Without `fields` the full bill with its items is returned. With a
+    fieldset, items are only joined and embedded when `include=items`;
+    that response is built directly as JSON and is not validated against
+    `response_model`.
+
     Args:
         db: Database session
+        fields: Optional sparse fieldset of bill columns
+        include: Optional relationships to embed
 
     Returns:
         List of all bills
     """
-    return get_all_bills(db=db)
+    fieldset, embed = _parse_sparse_query(fields, include)
+    if fieldset is None:
+        return get_all_bills(db=db)
+    rows = get_bill_fields(db=db, fields=fieldset, include_items="items" in embed)
+    return JSONResponse(content=jsonable_encoder(rows))
 
 
-@router.get("/{bill_id}", response_model=BillResponse)
+@router.get(
+    "/{bill_id}",
+    response_model=BillResponse,
+    dependencies=[query_budget_limit(max_queries=3, max_repeats=1)]
+)
 def get_bill_endpoint(
     bill_id: int,
-    db: Annotated[Session, Depends(get_db)]
+    db: Annotated[Session, Depends(get_db)],
+    fields: FieldsQuery = None,
+    include: IncludeQuery = None
 ) -> BillResponse:
     """
     Retrieve a specific bill by ID.
 
+    Without `fields` the full bill with its items is returned. With a
+    fieldset, items are only embedded when `include=items`; that response
+    is built directly as JSON and is not validated against `response_model`.
+
     Args:
         bill_id: ID of the bill
         db: Database session
+        fields: Optional sparse fieldset of bill columns
+        include: Optional relationships to embed
 
     Returns:
         Bill instance
     """
-    return get_bill_by_id(db=db, bill_id=bill_id)
-
-
-@router.put("/{bill_id}", response_model=BillResponse)
+    fieldset, embed = _parse_sparse_query(fields, include)
+    if fieldset is None:
+        return get_bill_by_id(db=db, bill_id=bill_id)
+    row = get_bill_fields(
+        db=db,
+        fields=fieldset,
+        include_items="items" in embed,
+        bill_id=bill_id
+    )[0]
+    return JSONResponse(content=jsonable_encoder(row))
+
+
+@router.put(
+    "/{bill_id}",
+    response_model=BillResponse,
+    # The bill is read once to update it and once more with its items
+    dependencies=[query_budget_limit(max_repeats=2)]
+)
 def update_bill_endpoint(
     bill_id: int,
     bill_data: BillUpdate,
@@ -86,6 +169,28 @@ def update_bill_endpoint(
     return update_bill(db=db, bill_id=bill_id, bill_data=bill_data)
 
 
+@router.post(
+    "/{bill_id}/checkout",
+    response_model=BillResponse,
+    dependencies=[query_budget_limit(max_repeats=1)]
+)
+def checkout_bill_endpoint(
+    bill_id: int,
+    db: Annotated[Session, Depends(get_db)]
+) -> BillResponse:
+    """
+    Close a bill, turning its active reservations into bill items.
+
+    Args:
+        bill_id: ID of the bill
+        db: Database session
+
+    Returns:
+        Closed Bill instance
+    """
+    return checkout_bill(db=db, bill_id=bill_id)
+
+
 @router.delete("/{bill_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_bill_endpoint(
     bill_id: int,
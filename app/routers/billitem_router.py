@@ -4,8 +4,9 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.schemas.billitem_schema import BillItemCreate, BillItemResponse
-from app.crud.billitem_crud import create_bill_item
+from app.schemas.bill_schema import BillResponse
+from app.schemas.billitem_schema import BillItemCreate, BillItemResponse, BillItemVoid
+from app.crud.billitem_crud import create_bill_item, void_bill_item, void_bill_items
 
 # Router is mounted under /api/v1/bills in main, so this router handles
 # the `/ {bill_id}/items` sub-path
@@ -34,3 +35,43 @@ def add_item_to_bill(
         quantity=item_data.quantity,
     )
     return bill_item
+
+
+@router.post("/void", response_model=BillResponse)
+def void_items_endpoint(
+    bill_id: int,
+    void_data: BillItemVoid,
+    db: Annotated[Session, Depends(get_db)]
+) -> BillResponse:
+    """
+    Void (or return) several items of a bill, restoring their stock.
+
+    Either every listed item is voided or, if one of them is not on the
+    bill, none is. Closed bills are rejected.
+
+    Args:
+        bill_id: ID of the bill
+        void_data: IDs of the items to void
+        db: Database session
+
+    Returns:
+        Bill with its remaining items
+    """
+    return void_bill_items(db=db, bill_id=bill_id, item_ids=void_data.item_ids)
+
+
+@router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+def void_item_endpoint(
+    bill_id: int,
+    item_id: int,
+    db: Annotated[Session, Depends(get_db)]
+) -> None:
+    """
+    Void a single item of a bill, restoring its stock.
+
+    Args:
+        bill_id: ID of the bill
+        item_id: ID of the bill item
+        db: Database session
+    """
+    void_bill_item(db=db, bill_id=bill_id, item_id=item_id)
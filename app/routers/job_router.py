@@ -0,0 +1,70 @@
+import os
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.job_schema import JobCreate, JobResponse
+from app.crud.job_crud import create_job, get_job, get_job_result_path
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def submit_job_endpoint(
+    job_data: JobCreate,
+    db: Annotated[Session, Depends(get_db)]
+) -> JobResponse:
+    """
+    Submit an export or report to run in the background.
+
+    Poll `GET /jobs/{job_id}` until the status is `done`, then download
+    the file from `download_url`.
+
+    Args:
+        job_data: Kind of report
+        db: Database session
+
+    Returns:
+        Queued job
+    """
+    return create_job(db=db, kind=job_data.kind)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job_endpoint(
+    job_id: int,
+    db: Annotated[Session, Depends(get_db)]
+) -> JobResponse:
+    """
+    Retrieve the status of a job.
+
+    Args:
+        job_id: ID of the job
+        db: Database session
+
+    Returns:
+        Job status and, once done, its download URL
+    """
+    return get_job(db=db, job_id=job_id)
+
+
+@router.get("/{job_id}/result", response_class=FileResponse)
+def download_job_result(
+    job_id: int,
+    db: Annotated[Session, Depends(get_db)]
+) -> FileResponse:
+    """
+    Download the CSV produced by a finished job.
+
+    Args:
+        job_id: ID of the job
+        db: Database session
+
+    Returns:
+        The result file
+    """
+    path = get_job_result_path(db=db, job_id=job_id)
+    return FileResponse(path, media_type="text/csv", filename=os.path.basename(path))
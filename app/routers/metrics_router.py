@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+
+from app.middleware.admission import admission_controller
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/admission")
+def admission_metrics() -> dict:
+    """
+    Queue depth and admission counters per route class.
+
+    Returns:
+        Mapping of route class to its limits, active/waiting requests and
+        admitted/rejected/timed out counts
+    """
+    return admission_controller.snapshot()
@@ -0,0 +1,76 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.reservation_schema import ReservationCreate, ReservationResponse
+from app.crud.reservation_crud import (
+    create_reservation,
+    get_bill_reservations,
+    release_reservation
+)
+
+# Mounted under /api/v1/bills in main, like the bill-item router
+router = APIRouter(prefix="/{bill_id}/reservations", tags=["Reservations"])
+
+
+@router.post("", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
+def reserve_stock(
+    bill_id: int,
+    reservation_data: ReservationCreate,
+    db: Annotated[Session, Depends(get_db)]
+) -> ReservationResponse:
+    """
+    Hold stock for a bill until checkout or until the hold expires.
+
+    Args:
+        bill_id: ID of the bill
+        reservation_data: Stock, quantity and optional TTL in seconds
+        db: Database session
+
+    Returns:
+        Created reservation
+    """
+    return create_reservation(
+        db=db,
+        bill_id=bill_id,
+        stock_id=reservation_data.stock_id,
+        quantity=reservation_data.quantity,
+        ttl_seconds=reservation_data.ttl_seconds
+    )
+
+
+@router.get("", response_model=list[ReservationResponse])
+def list_reservations(
+    bill_id: int,
+    db: Annotated[Session, Depends(get_db)]
+) -> list[ReservationResponse]:
+    """
+    Retrieve the reservations held by a bill.
+
+    Args:
+        bill_id: ID of the bill
+        db: Database session
+
+    Returns:
+        List of reservations
+    """
+    return get_bill_reservations(db=db, bill_id=bill_id)
+
+
+@router.delete("/{reservation_id}", status_code=status.HTTP_204_NO_CONTENT)
+def release_reservation_endpoint(
+    bill_id: int,
+    reservation_id: int,
+    db: Annotated[Session, Depends(get_db)]
+) -> None:
+    """
+    Release a reservation and make its stock available again.
+
+    Args:
+        bill_id: ID of the bill
+        reservation_id: ID of the reservation
+        db: Database session
+    """
+    release_reservation(db=db, bill_id=bill_id, reservation_id=reservation_id)
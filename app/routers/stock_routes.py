@@ -1,20 +1,42 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.schemas.stock_schema import StockCreate, StockUpdate, StockResponse
+from app.query_budget import query_budget_limit
+from app.schemas.stock_schema import (
+    STOCK_FIELDS,
+    StockCreate,
+    StockUpdate,
+    StockResponse,
+    StockShardingUpdate,
+    StockShards
+)
+from app.schemas.reservation_schema import StockAvailability
+from app.crud.fieldsets import parse_fieldset
+from app.crud.reservation_crud import get_stock_availability
+from app.crud.stock_shard_crud import get_stock_shards, set_stock_sharding
 from app.crud.stock_crud import (
     create_stock,
     get_all_stock,
+    get_all_stock_json,
+    get_stock_fields,
     get_stock_by_id,
+    get_stock_json,
     update_stock_partial,
     delete_stock
 )
 
 router = APIRouter(prefix="/stocks", tags=["Stock"])
 
+FieldsQuery = Annotated[
+    str | None,
+    Query(description="Comma separated list of fields to return, e.g. `id,product,quantity`")
+]
+
 
 @router.post("", response_model=StockResponse, status_code=status.HTTP_201_CREATED)
 def create_stock_endpoint(
@@ -35,35 +57,122 @@ def create_stock_endpoint(
 
 
 @router.get("", response_model=list[StockResponse])
-def list_all_stocks(db: Annotated[Session, Depends(get_db)]) -> list[StockResponse]:
+def list_all_stocks(
+    db: Annotated[Session, Depends(get_db)],
+    fields: FieldsQuery = None
+) -> list[StockResponse]:
     """
     Retrieve all stock items.
 
+    The full catalogue is served from the shared catalogue cache when it is
+    current, as pre-serialized JSON. Both that and the sparse fieldset
+    response are returned as raw JSON and bypass `response_model`.
+
     Args:
         db: Database session
+        fields: Optional sparse fieldset; only these columns are selected
 
     Returns:
         List of all Stock instances
     """
-    return get_all_stock(db=db)
-
-
-@router.get("/{stock_id}", response_model=StockResponse)
+    fieldset = parse_fieldset(fields, STOCK_FIELDS)
+    if fieldset is None:
+        cached = get_all_stock_json(db=db)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+        return get_all_stock(db=db)
+    return JSONResponse(content=jsonable_encoder(get_stock_fields(db=db, fields=fieldset)))
+
+
+@router.get(
+    "/{stock_id}",
+    response_model=StockResponse,
+    dependencies=[query_budget_limit(max_queries=2, max_repeats=1)]
+)
 def get_stock_endpoint(
     stock_id: int,
-    db: Annotated[Session, Depends(get_db)]
+    db: Annotated[Session, Depends(get_db)],
+    fields: FieldsQuery = None
 ) -> StockResponse:
     """
     Retrieve a specific stock item by ID.
 
+    Cached and sparse fieldset responses are returned as raw JSON and
+    bypass `response_model`.
+
     Args:
         stock_id: ID of the stock item
         db: Database session
+        fields: Optional sparse fieldset; only these columns are selected
 
     Returns:
         Stock instance
     """
-    return get_stock_by_id(db=db, stock_id=stock_id)
+    fieldset = parse_fieldset(fields, STOCK_FIELDS)
+    if fieldset is None:
+        cached = get_stock_json(db=db, stock_id=stock_id)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+        return get_stock_by_id(db=db, stock_id=stock_id)
+    row = get_stock_fields(db=db, fields=fieldset, stock_id=stock_id)[0]
+    return JSONResponse(content=jsonable_encoder(row))
+
+
+@router.get("/{stock_id}/availability", response_model=StockAvailability)
+def get_stock_availability_endpoint(
+    stock_id: int,
+    db: Annotated[Session, Depends(get_db)]
+) -> StockAvailability:
+    """
+    Retrieve on hand, reserved and available quantity of a stock item.
+
+    Args:
+        stock_id: ID of the stock item
+        db: Database session
+
+    Returns:
+        Stock availability
+    """
+    return get_stock_availability(db=db, stock_id=stock_id)
+
+
+@router.get("/{stock_id}/shards", response_model=StockShards)
+def get_stock_shards_endpoint(
+    stock_id: int,
+    db: Annotated[Session, Depends(get_db)]
+) -> StockShards:
+    """
+    Retrieve how a stock item's quantity is split across shards.
+
+    Args:
+        stock_id: ID of the stock item
+        db: Database session
+
+    Returns:
+        Shard count, exact total and per-shard quantities
+    """
+    return get_stock_shards(db=db, stock_id=stock_id)
+
+
+@router.put("/{stock_id}/shards", response_model=StockShards)
+def set_stock_sharding_endpoint(
+    stock_id: int,
+    sharding: StockShardingUpdate,
+    db: Annotated[Session, Depends(get_db)]
+) -> StockShards:
+    """
+    Split a best-selling item into shards so concurrent sales do not queue
+    on its stock row, or fold it back with `shard_count` 0.
+
+    Args:
+        stock_id: ID of the stock item
+        sharding: New number of shards
+        db: Database session
+
+    Returns:
+        New shard layout
+    """
+    return set_stock_sharding(db=db, stock_id=stock_id, shard_count=sharding.shard_count)
 
 
 @router.patch("/{stock_id}", response_model=StockResponse)
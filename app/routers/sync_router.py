@@ -0,0 +1,33 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.sync_schema import SyncChangesResponse
+from app.crud.sync_crud import get_changes
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+@router.get("/changes", response_model=SyncChangesResponse)
+def list_changes(
+    db: Annotated[Session, Depends(get_db)],
+    since: Annotated[str | None, Query(description="Cursor from the previous response; omit for a full sync")] = None,
+    limit: Annotated[int, Query(ge=1, le=5000)] = 500
+) -> SyncChangesResponse:
+    """
+    Retrieve stock, bill and bill item changes since the client's cursor.
+
+    Upserts carry the row data; deletions are returned with op `delete`.
+    Keep calling with `next_cursor` while `has_more` is true.
+
+    Args:
+        db: Database session
+        since: Cursor from the previous response
+        limit: Maximum changes per page
+
+    Returns:
+        Page of changes and the next cursor
+    """
+    return get_changes(db=db, since=since, limit=limit)
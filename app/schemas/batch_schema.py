@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+from app.schemas.bill_schema import BillResponse
+from app.schemas.stock_schema import StockResponse
+
+# Upper bound on ids per resource type in one batch
+MAX_BATCH_IDS = 200
+
+
+class BatchRequest(BaseModel):
+    """Ids to resolve in one round trip, grouped by resource type"""
+    stocks: list[int] = Field(default=[], max_length=MAX_BATCH_IDS)
+    bills: list[int] = Field(default=[], max_length=MAX_BATCH_IDS)
+
+
+class StockBatchEntry(BaseModel):
+    """Result of one stock lookup; data is only set when status is 200"""
+    id: int
+    status: int
+    data: Optional[StockResponse] = None
+    detail: Optional[str] = None
+
+
+class BillBatchEntry(BaseModel):
+    """Result of one bill lookup; data is only set when status is 200"""
+    id: int
+    status: int
+    data: Optional[BillResponse] = None
+    detail: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    """Per-id results in the order requested, duplicates removed"""
+    stocks: list[StockBatchEntry] = []
+    bills: list[BillBatchEntry] = []
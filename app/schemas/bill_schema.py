@@ -31,5 +31,11 @@ class BillResponse(BillBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Columns selectable through the `?fields=` sparse fieldset; items are
+# embedded separately with `?include=items`
+BILL_FIELDS = set(BillResponse.model_fields) - {"items"}
+BILL_INCLUDES = {"items"}
+
+
 # Legacy aliases for backward compatibility
 BillOut = BillResponse
@@ -1,7 +1,10 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional
 
+# Upper bound on lines voided in one request
+MAX_VOID_ITEMS = 200
+
 
 class StockInfo(BaseModel):
     """Nested schema for Stock information in BillItem response"""
@@ -22,6 +25,11 @@ class BillItemCreate(BillItemBase):
     stock_id: int
 
 
+class BillItemVoid(BaseModel):
+    """Schema for voiding several items of a bill at once"""
+    item_ids: list[int] = Field(min_length=1, max_length=MAX_VOID_ITEMS)
+
+
 class BillItemResponse(BillItemBase):
     """Schema for BillItem response with nested Stock information"""
     id: int
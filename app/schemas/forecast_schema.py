@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class ReorderPoint(BaseModel):
+    """Demand forecast and reorder recommendation of one SKU"""
+    stock_id: int
+    product: Optional[str] = None
+    on_hand: int
+    available: int
+    avg_daily_demand: float
+    demand_std: float
+    days_of_cover: Optional[float] = None  # None when the SKU has no recent demand
+    reorder_point: float
+    suggested_order: int
+
+
+class ReorderPointsResponse(BaseModel):
+    """Forecast parameters and the SKUs closest to running out"""
+    generated_at: datetime
+    window_days: int
+    lead_time_days: float
+    sku_count: int
+    reorder_count: int
+    items: list[ReorderPoint]
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, ConfigDict, computed_field
+from datetime import datetime
+from typing import Literal, Optional
+
+
+class JobCreate(BaseModel):
+    """Schema for submitting a background export or report"""
+    kind: Literal["bill_history", "inventory_valuation"]
+
+
+class JobResponse(BaseModel):
+    """Schema for Job status"""
+    id: int
+    kind: str
+    status: str
+    result_rows: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @computed_field
+    @property
+    def download_url(self) -> Optional[str]:
+        return f"/api/v1/jobs/{self.id}/result" if self.status == "done" else None
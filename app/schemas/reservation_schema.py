@@ -0,0 +1,30 @@
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+from typing import Optional
+
+
+class ReservationCreate(BaseModel):
+    """Schema for holding stock against a bill"""
+    stock_id: int
+    quantity: int = Field(gt=0)
+    ttl_seconds: Optional[int] = Field(default=None, gt=0)
+
+
+class ReservationResponse(BaseModel):
+    """Schema for StockReservation response"""
+    id: int
+    bill_id: int
+    stock_id: int
+    quantity: int
+    created_at: datetime
+    expires_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class StockAvailability(BaseModel):
+    """On hand, reserved and available quantity of a stock item"""
+    stock_id: int
+    on_hand: int
+    reserved: int
+    available: int
@@ -28,9 +28,28 @@ class StockUpdate(BaseModel):
 class StockResponse(StockBase):
     """Schema for Stock response"""
     id: int
+    reserved_quantity: int = 0
+    shard_count: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class StockShardingUpdate(BaseModel):
+    """Schema for splitting a hot stock item into shards (0 disables)"""
+    shard_count: int = Field(ge=0)
+
+
+class StockShards(BaseModel):
+    """Shard layout of a stock item"""
+    stock_id: int
+    shard_count: int
+    quantity: int
+    shards: list[int]
+
+
+# Columns selectable through the `?fields=` sparse fieldset
+STOCK_FIELDS = set(StockResponse.model_fields)
+
+
 # Legacy alias for backward compatibility
 StockOut = StockResponse
\ No newline at end of file
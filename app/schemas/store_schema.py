@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class StoreSummary(BaseModel):
+    """Inventory and bill totals of one store"""
+    sku_count: int
+    units_on_hand: int
+    inventory_value: float
+    open_bills: int
+
+
+class StoresSummaryResponse(BaseModel):
+    """Per-store summaries plus the totals across every store"""
+    stores: dict[str, StoreSummary]
+    total: StoreSummary
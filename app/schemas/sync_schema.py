@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Optional
+
+
+class SyncChange(BaseModel):
+    """One changed or deleted row"""
+    entity: str
+    op: str
+    id: int
+    updated_at: datetime
+    data: Optional[dict[str, Any]] = None
+
+
+class SyncChangesResponse(BaseModel):
+    """A page of changes and the cursor to request the next one with"""
+    changes: list[SyncChange]
+    next_cursor: Optional[str] = None
+    has_more: bool
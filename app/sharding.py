@@ -0,0 +1,49 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+
+def _enable_sqlite_wal(dbapi_connection, connection_record) -> None:
+    # WAL lets readers (long exports, reports) run without blocking writers
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+class ShardRouter:
+    """
+    Maps store ids to database engines.
+
+    Several stores may point to the same database URL; they then share one
+    engine (and connection pool) and are told apart by their `store_id`.
+    """
+
+    def __init__(self, shard_map: dict[str, str], default_store: str) -> None:
+        self.shard_map = shard_map
+        self.default_store = default_store
+        self._engines: dict[str, Engine] = {}
+
+    @property
+    def stores(self) -> list[str]:
+        return list(self.shard_map)
+
+    def has_store(self, store_id: str) -> bool:
+        return store_id in self.shard_map
+
+    def engine_for(self, store_id: str) -> Engine:
+        """
+        Engine of the database holding a store, created on first use.
+
+        Raises:
+            KeyError: If the store is not in the shard map
+        """
+        url = self.shard_map[store_id]
+        if url not in self._engines:
+            engine = create_engine(url)
+            if engine.dialect.name == "sqlite":
+                event.listen(engine, "connect", _enable_sqlite_wal)
+            self._engines[url] = engine
+        return self._engines[url]
+
+    def engines(self) -> list[Engine]:
+        """One engine per distinct database."""
+        return list({id(engine): engine for engine in map(self.engine_for, self.stores)}.values())
@@ -0,0 +1,223 @@
+"""
+Measure sustained sales per second of a single product, plain vs sharded.
+
+Two clients drive the load, each with one transaction per sale:
+
+- `orm` (default): worker processes call `create_bill_item`, the code path
+  of the API. Each sale costs several ms of Python, so unless the machine
+  has enough cores for the workers and the database, the client is the
+  bottleneck and both modes look alike.
+- `pgbench`: pgbench connections run the statements `create_bill_item`
+  issues (bill and stock reads, stock or shard decrement, bill_item INSERT
+  and refresh) against the same tables. Client cost is negligible, so this
+  shows the row-lock contention sharding removes.
+
+Row locks only show up on a real server, so point it at a scratch
+PostgreSQL database (SQLite serializes every writer regardless):
+
+    python -m scripts.bench_hot_sku --database-url postgresql+psycopg2://localhost/bench
+    python -m scripts.bench_hot_sku --database-url postgresql+psycopg2://localhost/bench \
+        --client pgbench --workers 1,8,32
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.engine import Engine, make_url
+
+from app.config import settings
+from app.crud.billitem_crud import create_bill_item
+from app.crud.stock_shard_crud import set_stock_sharding
+from app.database import DBBase, Sessao_
+from app.models import all_models  # noqa: F401
+from app.models.bill import Bill
+from app.models.billitem import BillItem
+from app.models.stock import Stock
+
+
+def worker(database_url: str, store_id: str, bill_id: int, stock_id: int, duration: float,
+           start_barrier, results) -> None:
+    """Sell one unit at a time until the duration is over; report the latencies."""
+    engine = create_engine(database_url, pool_size=1)
+    db = Sessao_(bind=engine, info={"store_id": store_id})
+    latencies = []
+    start_barrier.wait()
+    deadline = time.perf_counter() + duration
+    try:
+        while (now := time.perf_counter()) < deadline:
+            create_bill_item(db, bill_id, stock_id, 1, unit_price=1.0)
+            latencies.append(time.perf_counter() - now)
+            db.expunge_all()
+    finally:
+        db.close()
+        engine.dispose()
+        results.put(latencies)
+
+
+def drive_orm(database_url: str, store_id: str, bill_ids: list[int], stock_id: int,
+              duration: float) -> list[float]:
+    """Sell through `create_bill_item` from one process per bill; returns the latencies."""
+    context = multiprocessing.get_context("spawn")
+    start_barrier = context.Barrier(len(bill_ids))
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=worker,
+            args=(database_url, store_id, bill_id, stock_id, duration, start_barrier, results)
+        )
+        for bill_id in bill_ids
+    ]
+    for process in processes:
+        process.start()
+    samples = [sample for _ in processes for sample in results.get()]
+    for process in processes:
+        process.join()
+    return samples
+
+
+def pgbench_script(store_id: str, bill_ids: list[int], stock_id: int, shard_count: int) -> str:
+    """
+    One sale as a pgbench transaction, issuing the statements of
+    `create_bill_item` for a plain or sharded stock item: the bill and
+    stock reads, the stock or shard decrement, the bill_item INSERT and,
+    after the commit, the refresh of the new row. Each client sells on its
+    own bill, like the ORM workers.
+    """
+    store = store_id.replace("'", "''")
+    bills = ",".join(str(bill_id) for bill_id in bill_ids)
+    if shard_count:
+        decrement = (
+            f"\\set shard random(0, {shard_count - 1})\n"
+            "UPDATE stock_shard SET quantity = quantity - 1"
+            f" WHERE stock_id = {stock_id} AND shard_no = :shard AND quantity >= 1"
+            f" AND store_id = '{store}';\n"
+        )
+    else:
+        decrement = (
+            "UPDATE stock SET quantity = quantity - 1, updated_at = now()"
+            f" WHERE id = {stock_id} AND quantity - reserved_quantity >= 1"
+            f" AND store_id = '{store}';\n"
+        )
+    return (
+        "BEGIN;\n"
+        # \gset with the prefix bill_ binds the bill columns as :bill_id, :bill_status, ...
+        f"SELECT * FROM bill WHERE id = (ARRAY[{bills}])[:client_id + 1] AND store_id = '{store}' \\gset bill_\n"
+        f"SELECT * FROM stock WHERE id = {stock_id} AND store_id = '{store}';\n"
+        + decrement +
+        "INSERT INTO bill_item (bill_id, stock_id, quantity, unit_price, created_at, updated_at, store_id)"
+        f" VALUES (:bill_id, {stock_id}, 1, 1.0, now(), now(), '{store}') RETURNING id \\gset item_\n"
+        "END;\n"
+        f"SELECT * FROM bill_item WHERE id = :item_id AND store_id = '{store}';\n"
+    )
+
+
+def drive_pgbench(database_url: str, store_id: str, bill_ids: list[int], stock_id: int,
+                  shard_count: int, duration: float, pgbench: str) -> list[float]:
+    """Sell through pgbench with one connection per bill; returns the latencies."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        raise SystemExit("--client pgbench needs a PostgreSQL --database-url")
+    environment = dict(os.environ)
+    if url.password:
+        environment["PGPASSWORD"] = url.password
+    connection = [
+        "-h", url.query.get("host") or url.host or "localhost",
+        "-p", str(url.port or 5432),
+        "-U", url.username or environment.get("PGUSER", "postgres"),
+    ]
+    clients = len(bill_ids)
+
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "sale.sql")
+        with open(script, "w") as file:
+            file.write(pgbench_script(store_id, bill_ids, stock_id, shard_count))
+        subprocess.run(
+            [pgbench, *connection, "-n", "-f", script, "-c", str(clients),
+             "-j", str(min(clients, os.cpu_count() or 1)), "-T", str(max(1, round(duration))),
+             "-l", "--log-prefix", os.path.join(directory, "log"), url.database],
+            check=True, capture_output=True, env=environment
+        )
+        # Per-transaction log lines: client, transaction, latency (us), ...
+        samples = []
+        for log_path in glob.glob(os.path.join(directory, "log.*")):
+            with open(log_path) as log:
+                samples.extend(int(re.split(r"\s+", line)[2]) / 1e6 for line in log if line.strip())
+    return samples
+
+
+def run(engine: Engine, database_url: str, store_id: str, shard_count: int, workers: int,
+        duration: float, client: str = "orm", pgbench: str = "pgbench") -> tuple[float, float, float]:
+    """
+    Sell one product from `workers` clients for `duration` seconds.
+
+    Returns:
+        Sales per second, p50 and p99 latency in milliseconds
+    """
+    tag = uuid.uuid4().hex[:8]
+    db = Sessao_(bind=engine, info={"store_id": store_id})
+    stock = Stock(product=f"bench-{tag}", category="bench", quantity=10**9, product_price=1.0)
+    bills = [Bill(customer_name=f"bench-{tag}-{i}") for i in range(workers)]
+    db.add_all([stock, *bills])
+    db.commit()
+    stock_id, bill_ids = stock.id, [bill.id for bill in bills]
+    if shard_count:
+        set_stock_sharding(db, stock_id, shard_count)
+    db.close()
+
+    try:
+        if client == "pgbench":
+            samples = drive_pgbench(database_url, store_id, bill_ids, stock_id, shard_count, duration, pgbench)
+        else:
+            samples = drive_orm(database_url, store_id, bill_ids, stock_id, duration)
+    finally:
+        # Leave the database as it was
+        db = Sessao_(bind=engine, info={"store_id": store_id})
+        db.execute(delete(BillItem).where(BillItem.bill_id.in_(bill_ids)))
+        db.execute(delete(Bill).where(Bill.id.in_(bill_ids)))
+        db.delete(db.get(Stock, stock_id))
+        db.commit()
+        db.close()
+
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1] if samples else 0.0
+    p50 = statistics.median(samples) if samples else 0.0
+    return len(samples) / duration, p50 * 1000, p99 * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--store-id", default=settings.DEFAULT_STORE_ID)
+    parser.add_argument("--workers", default="1,2,4,8,16", help="comma separated concurrency levels")
+    parser.add_argument("--shards", default="0,16", help="comma separated shard counts, 0 = plain row")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run")
+    parser.add_argument("--client", choices=["orm", "pgbench"], default="orm",
+                        help="orm: create_bill_item from worker processes; pgbench: the same SQL via pgbench")
+    parser.add_argument("--pgbench", default=shutil.which("pgbench") or "pgbench",
+                        help="path of the pgbench binary")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    DBBase.metadata.create_all(bind=engine)
+    if engine.dialect.name == "sqlite":
+        print("warning: SQLite serializes all writers, sharding cannot help there")
+
+    print(f"{'shards':>6} {'workers':>7} {'sales/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for shard_count in (int(value) for value in args.shards.split(",")):
+        for workers in (int(value) for value in args.workers.split(",")):
+            rate, p50, p99 = run(engine, args.database_url, args.store_id, shard_count, workers,
+                                 args.duration, args.client, args.pgbench)
+            print(f"{shard_count:>6} {workers:>7} {rate:>9,.0f} {p50:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
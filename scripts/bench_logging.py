@@ -0,0 +1,72 @@
+"""
+Measure the per-request latency of the hot routes including logging cost.
+
+Run with stderr sent to a file so log writes hit real I/O, e.g.:
+    python -m scripts.bench_logging 2> /tmp/bench.log
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.database import Sessao_  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.bill import Bill  # noqa: E402
+from app.models.stock import Stock  # noqa: E402
+
+ROUTES = [
+    ("GET", "/", None),
+    ("GET", "/api/v1/health", None),
+    ("GET", "/api/v1/stocks/1", None),
+    ("GET", "/api/v1/stocks", None),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stocks", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    db = Sessao_()
+    db.add_all(
+        Stock(id=i, product=f"Produto {i}", category="Bebidas", quantity=10**9, product_price=9.9)
+        for i in range(1, args.stocks + 1)
+    )
+    db.add(Bill(id=1, customer_name="Mesa 1"))
+    db.commit()
+    db.close()
+
+    # The test client logs every request itself; keep it out of the numbers
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    # Cost paid by the request thread for one log call with the current setup
+    emit_logger = logging.getLogger("app.access")
+    start = time.perf_counter()
+    for n in range(args.repeat * 10):
+        emit_logger.info("GET /api/v1/stocks %s", 200, extra={"duration_ms": n})
+    per_call = (time.perf_counter() - start) / (args.repeat * 10) * 1_000_000
+    print(f"{'logger.info() on request thread':<32} {per_call:>8.2f} us/call", file=sys.stdout)
+
+    client = TestClient(app)
+    print(f"{'route':<32} {'p50 ms':>8} {'p99 ms':>8}", file=sys.stdout)
+    for method, path, body in ROUTES:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            client.request(method, path, json=body)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        print(f"{method + ' ' + path:<32} {statistics.median(timings):>8.3f} {p99:>8.3f}", file=sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
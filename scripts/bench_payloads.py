@@ -0,0 +1,96 @@
+"""
+Measure payload size and latency of the stock/bill list endpoints.
+
+Seeds a throw-away SQLite database and compares the full responses with
+sparse fieldsets, with and without response compression.
+
+Run with: python -m scripts.bench_payloads [--stocks 2000] [--bills 300]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.database import Sessao_, engine  # noqa: E402
+
+engine.echo = False
+
+from app.main import app  # noqa: E402
+from app.models.bill import Bill  # noqa: E402
+from app.models.billitem import BillItem  # noqa: E402
+from app.models.stock import Stock  # noqa: E402
+
+CASES = [
+    ("/api/v1/stocks", None),
+    ("/api/v1/stocks?fields=id,product,quantity", None),
+    ("/api/v1/bills", None),
+    ("/api/v1/bills?fields=id,customer_name,status", None),
+    ("/api/v1/bills?fields=id,customer_name&include=items", None),
+    ("/api/v1/stocks", "gzip"),
+    ("/api/v1/stocks", "br"),
+    ("/api/v1/bills", "gzip"),
+    ("/api/v1/bills", "br"),
+    ("/api/v1/bills?fields=id,customer_name,status", "br"),
+]
+
+
+def seed(stocks: int, bills: int, items_per_bill: int) -> None:
+    """Insert synthetic rows with explicit ids."""
+    db = Sessao_()
+    db.add_all(
+        Stock(
+            id=i,
+            product=f"Produto {i}",
+            category=f"Categoria {i % 12}",
+            quantity=100,
+            product_price=10.0 + i % 50,
+            product_buy=5.0 + i % 20,
+        )
+        for i in range(1, stocks + 1)
+    )
+    db.add_all(Bill(id=i, customer_name=f"Cliente {i}") for i in range(1, bills + 1))
+    db.add_all(
+        BillItem(
+            id=(bill - 1) * items_per_bill + n + 1,
+            bill_id=bill,
+            stock_id=(bill * 7 + n) % stocks + 1,
+            quantity=1 + n % 3,
+            unit_price=12.5,
+        )
+        for bill in range(1, bills + 1)
+        for n in range(items_per_bill)
+    )
+    db.commit()
+    db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stocks", type=int, default=2000)
+    parser.add_argument("--bills", type=int, default=300)
+    parser.add_argument("--items-per-bill", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    seed(args.stocks, args.bills, args.items_per_bill)
+    client = TestClient(app)
+
+    print(f"{'endpoint':<55} {'encoding':<9} {'bytes':>10} {'p50 ms':>8}")
+    for path, encoding in CASES:
+        headers = {"Accept-Encoding": encoding or "identity"}
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            response = client.get(path, headers=headers)
+            timings.append((time.perf_counter() - start) * 1000)
+        size = int(response.headers.get("content-length", len(response.content)))
+        print(f"{path:<55} {encoding or '-':<9} {size:>10} {statistics.median(timings):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
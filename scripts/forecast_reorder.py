@@ -0,0 +1,67 @@
+"""
+Compute demand forecasts and reorder points for every SKU of a store.
+
+Batch counterpart of GET /api/v1/analytics/reorder-points: runs the same
+vectorized computation over the whole catalogue and writes one CSV row per
+SKU, ordered by days of cover.
+
+Run with: python -m scripts.forecast_reorder --store-id default --output reorder.csv
+"""
+import argparse
+import csv
+import sys
+import time
+from datetime import date, datetime, UTC
+
+import numpy as np
+
+from app.config import settings
+from app.crud.forecast_crud import compute_reorder_points
+from app.database import session_for_store
+from app.models import all_models  # noqa: F401
+
+COLUMNS = [
+    "stock_id", "product", "on_hand", "available", "avg_daily_demand",
+    "demand_std", "days_of_cover", "reorder_point", "suggested_order",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--store-id", default=settings.DEFAULT_STORE_ID)
+    parser.add_argument("--today", type=date.fromisoformat, default=datetime.now(UTC).date(),
+                        help="first day excluded from the history (YYYY-MM-DD)")
+    parser.add_argument("--output", help="CSV file, defaults to stdout")
+    args = parser.parse_args()
+
+    db = session_for_store(args.store_id)
+    try:
+        start = time.perf_counter()
+        forecast = compute_reorder_points(db, args.today)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+
+    order = np.argsort(forecast["days_of_cover"], kind="stable")
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.writer(output)
+        writer.writerow(COLUMNS)
+        writer.writerows(
+            zip(*(np.round(forecast[column][order], 3) if forecast[column].dtype.kind == "f"
+                  else forecast[column][order] for column in COLUMNS))
+        )
+    finally:
+        if args.output:
+            output.close()
+
+    needs_reorder = (forecast["avg_daily_demand"] > 0) & (forecast["available"] <= forecast["reorder_point"])
+    print(
+        f"{len(order)} SKUs, {int(needs_reorder.sum())} at or below reorder point, "
+        f"computed in {elapsed:.2f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
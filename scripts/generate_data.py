@@ -0,0 +1,317 @@
+"""
+Generate a synthetic, reproducible dataset for capacity planning.
+
+Creates users, stock items, bills with bill items, and sales with sale items.
+Product popularity follows a Zipf distribution so a few SKUs dominate, as
+in a real bar. Rows are written with bulk inserts, or with COPY on
+PostgreSQL, using explicit ids that continue after the rows already in
+each table.
+
+The same --seed and --end-date produce the same rows when the tables start
+empty, e.g. with --reset. Appending to existing rows shifts the ids, and
+with them product and customer names, so the dataset is then reproducible
+only relative to what was already there.
+
+Run with: python -m scripts.generate_data --stocks 100000 --bills 200000
+Use --store-id to fill the database of one store from SHARD_MAP.
+"""
+import argparse
+import csv
+import io
+import random
+import time
+from bisect import bisect_left
+from datetime import date, datetime, time as dt_time, timedelta, UTC
+from itertools import accumulate, islice
+from typing import Iterable, Iterator
+
+from sqlalchemy import Table, create_engine, func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.catalogue_cache import catalogue_cache
+from app.config import settings
+from app.database import DBBase
+from app.models import all_models  # noqa: F401
+from app.models.bill import Bill
+from app.models.billitem import BillItem
+from app.models.itemsales import SaleItem
+from app.models.sales import Sales
+from app.models.stock import Stock
+from app.models.user import User
+
+CATEGORIES = [
+    "Cervejas", "Destilados", "Drinks", "Vinhos", "Refrigerantes",
+    "Petiscos", "Pratos", "Sobremesas", "Cafés", "Tabacaria",
+]
+
+# Units per line: most lines are a single unit, a few are rounds
+LINE_QUANTITIES = [1, 2, 3, 4, 6]
+LINE_WEIGHTS = list(accumulate([60, 20, 10, 6, 4]))
+
+
+def chunked(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def next_id(conn: Connection, table: Table) -> int:
+    """First free id of a table, so generated rows never collide."""
+    return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def sqlite_rows(chunk: list[tuple]) -> list[tuple]:
+    """Render datetimes in the format SQLAlchemy stores (and parses) on SQLite."""
+    time_columns = [i for i, value in enumerate(chunk[0]) if isinstance(value, datetime)]
+    if not time_columns:
+        return chunk
+    rows = []
+    for row in chunk:
+        row = list(row)
+        for i in time_columns:
+            row[i] = row[i].isoformat(" ", "microseconds")[:26]
+        rows.append(tuple(row))
+    return rows
+
+
+def bulk_load(conn: Connection, table: Table, columns: list[str], rows: Iterable[tuple], chunk_size: int) -> int:
+    """
+    Write rows using COPY on PostgreSQL, a driver-level executemany on
+    SQLite and a Core executemany elsewhere.
+
+    Returns:
+        Number of rows written
+    """
+    written = 0
+    dialect = conn.dialect.name
+    for chunk in chunked(rows, chunk_size):
+        if dialect == "postgresql":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(chunk)
+            buffer.seek(0)
+            cursor = conn.connection.cursor()
+            cursor.copy_expert(
+                f'COPY "{table.name}" ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)',
+                buffer,
+            )
+        elif dialect == "sqlite":
+            placeholders = ", ".join("?" for _ in columns)
+            conn.exec_driver_sql(
+                f'INSERT INTO "{table.name}" ({", ".join(columns)}) VALUES ({placeholders})',
+                sqlite_rows(chunk),
+            )
+        else:
+            conn.execute(table.insert(), [dict(zip(columns, row)) for row in chunk])
+        written += len(chunk)
+    return written
+
+
+def reset_sequences(conn: Connection, tables: list[Table]) -> None:
+    """Move PostgreSQL id sequences past the explicitly inserted ids."""
+    if conn.dialect.name != "postgresql":
+        return
+    for table in tables:
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('\"{table.name}\"', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM \"{table.name}\"))"
+        ))
+
+
+class DatasetGenerator:
+    """Produces the rows of every table from a single seeded RNG."""
+
+    def __init__(self, args: argparse.Namespace, first_ids: dict[str, int]) -> None:
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.first_ids = first_ids
+        self.end = datetime.combine(args.end_date, dt_time.min, UTC)
+        self.stock_prices: list[float] = []
+        self.bill_times: list[datetime] = []
+        self.usernames: list[str] = []
+        self.sale_item_rows: list[tuple] = []
+
+        # Popularity rank -> stock id; ranks are shuffled so the best sellers
+        # are spread across the id range instead of being the first rows
+        stock_ids = list(range(first_ids["stock"], first_ids["stock"] + args.stocks))
+        self.rng.shuffle(stock_ids)
+        self.ranked_stock_ids = stock_ids
+        self.popularity = list(accumulate(1 / rank ** args.zipf for rank in range(1, args.stocks + 1)))
+
+    def random_time(self) -> datetime:
+        return self.end - timedelta(seconds=self.rng.random() * self.args.days * 86400)
+
+    def pick_stock(self) -> int:
+        """Stock id drawn from the Zipf popularity distribution."""
+        position = bisect_left(self.popularity, self.rng.random() * self.popularity[-1])
+        return self.ranked_stock_ids[position]
+
+    def pick_quantity(self) -> int:
+        return LINE_QUANTITIES[bisect_left(LINE_WEIGHTS, self.rng.random() * LINE_WEIGHTS[-1])]
+
+    def users(self) -> Iterator[tuple]:
+        first = self.first_ids["user"]
+        for user_id in range(first, first + self.args.users):
+            username = f"user{user_id}"
+            self.usernames.append(username)
+            yield (user_id, username, f"Funcionario {user_id}", 11900000000 + user_id, self.random_time())
+
+    def stocks(self) -> Iterator[tuple]:
+        first = self.first_ids["stock"]
+        for stock_id in range(first, first + self.args.stocks):
+            buy = round(self.rng.uniform(1.0, 80.0), 2)
+            price = round(buy * self.rng.uniform(1.3, 3.0), 2)
+            self.stock_prices.append(price)
+            category = self.rng.choice(CATEGORIES)
+            quantity = self.rng.randint(0, 500)
+            created_at = self.random_time()
+            yield (
+                stock_id,
+                f"Produto {stock_id}",
+                category,
+                quantity,
+                price,
+                buy,
+                created_at,
+                created_at,
+                self.rng.choice(self.usernames) if self.usernames else None,
+                self.args.store_id,
+            )
+
+    def bills(self) -> Iterator[tuple]:
+        first = self.first_ids["bill"]
+        for bill_id in range(first, first + self.args.bills):
+            created_at = self.random_time()
+            self.bill_times.append(created_at)
+            status = "Aberto" if self.end - created_at < timedelta(hours=6) else "Fechado"
+            yield (bill_id, f"Cliente {bill_id}", status, created_at, created_at, self.args.store_id)
+
+    def bill_items(self) -> Iterator[tuple]:
+        item_id = self.first_ids["bill_item"]
+        max_lines = 2 * self.args.items_per_bill - 1
+        for offset, opened_at in enumerate(self.bill_times):
+            bill_id = self.first_ids["bill"] + offset
+            for _ in range(self.rng.randint(1, max_lines)):
+                stock_id = self.pick_stock()
+                quantity = self.pick_quantity()
+                created_at = opened_at + timedelta(seconds=self.rng.random() * 4 * 3600)
+                yield (
+                    item_id,
+                    bill_id,
+                    stock_id,
+                    quantity,
+                    self.stock_prices[stock_id - self.first_ids["stock"]],
+                    created_at,
+                    created_at,
+                    self.args.store_id,
+                )
+                item_id += 1
+
+    def sales(self) -> Iterator[tuple]:
+        """Sales rows; their lines are kept for `sale_items`."""
+        item_id = self.first_ids["saleitems"]
+        max_lines = 2 * self.args.items_per_sale - 1
+        user_ids = list(range(self.first_ids["user"], self.first_ids["user"] + self.args.users))
+        for sale_id in range(self.first_ids["sales"], self.first_ids["sales"] + self.args.sales):
+            total = 0.0
+            for _ in range(self.rng.randint(1, max_lines)):
+                stock_id = self.pick_stock()
+                unit_price = self.stock_prices[stock_id - self.first_ids["stock"]]
+                line_total = round(unit_price * self.pick_quantity(), 2)
+                total += line_total
+                # product_name is unique in the model, so it is left empty
+                self.sale_item_rows.append((item_id, sale_id, stock_id, None, unit_price, line_total))
+                item_id += 1
+            user_id = self.rng.choice(user_ids) if user_ids else None
+            yield (sale_id, user_id, round(total, 2), self.random_time())
+
+    def sale_items(self) -> Iterator[tuple]:
+        yield from self.sale_item_rows
+
+
+def with_dependents(tables: list[Table]) -> list[Table]:
+    """The tables plus every table referencing them by foreign key, transitively."""
+    selected = set(tables)
+    for table in DBBase.metadata.sorted_tables:
+        if any(fk.column.table in selected for fk in table.foreign_keys):
+            selected.add(table)
+    return [table for table in DBBase.metadata.sorted_tables if table in selected]
+
+
+def generate(engine: Engine, args: argparse.Namespace) -> None:
+    tables = {
+        "user": User.__table__,
+        "stock": Stock.__table__,
+        "bill": Bill.__table__,
+        "bill_item": BillItem.__table__,
+        "sales": Sales.__table__,
+        "saleitems": SaleItem.__table__,
+    }
+    if args.reset:
+        # Reservations, shards, ... reference these tables and must go too
+        reset_tables = with_dependents(list(tables.values()))
+        DBBase.metadata.drop_all(bind=engine, tables=reset_tables)
+        DBBase.metadata.create_all(bind=engine, tables=reset_tables)
+    DBBase.metadata.create_all(bind=engine, tables=list(tables.values()))
+
+    with engine.begin() as conn:
+        first_ids = {name: next_id(conn, table) for name, table in tables.items()}
+        if any(first_id != 1 for first_id in first_ids.values()):
+            print("note: appending to existing rows; use --reset for a reproducible dataset")
+        generator = DatasetGenerator(args, first_ids)
+
+        steps = [
+            ("user", ["id", "username", "fullname", "phone", "create_at"], generator.users),
+            ("stock", ["id", "product", "category", "quantity", "product_price", "product_buy",
+                       "created_at", "updated_at", "created_by", "store_id"], generator.stocks),
+            ("bill", ["id", "customer_name", "status", "created_at", "updated_at", "store_id"],
+             generator.bills),
+            ("bill_item", ["id", "bill_id", "stock_id", "quantity", "unit_price", "created_at",
+                           "updated_at", "store_id"], generator.bill_items),
+            ("sales", ["id", "user_id", "total", "created_at"], generator.sales),
+            ("saleitems", ["id", "sale_id", "stock_id", "product_name", "unit_price", "total"],
+             generator.sale_items),
+        ]
+        for name, columns, rows in steps:
+            start = time.perf_counter()
+            count = bulk_load(conn, tables[name], columns, rows(), args.chunk_size)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<10} {count:>10} rows  {elapsed:7.2f}s  ({count / max(elapsed, 1e-9):,.0f} rows/s)")
+
+        reset_sequences(conn, list(tables.values()))
+
+    # Running workers on this host must not keep serving the old catalogue
+    cache = catalogue_cache(engine.url, args.store_id)
+    if cache:
+        cache.bump()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--store-id", default=settings.DEFAULT_STORE_ID,
+                        help="store owning the generated rows")
+    parser.add_argument("--database-url", help="defaults to the store's database in SHARD_MAP")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--stocks", type=int, default=1000)
+    parser.add_argument("--bills", type=int, default=10000)
+    parser.add_argument("--items-per-bill", type=int, default=5, help="mean lines per bill")
+    parser.add_argument("--sales", type=int, default=5000)
+    parser.add_argument("--items-per-sale", type=int, default=3, help="mean lines per sale")
+    parser.add_argument("--days", type=int, default=365, help="history length")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today(),
+                        help="last day of history (YYYY-MM-DD); with --seed, fixes the dataset on empty tables")
+    parser.add_argument("--zipf", type=float, default=1.1, help="popularity skew exponent")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--reset", action="store_true",
+                        help="drop and recreate the tables first, with the tables referencing "
+                             "them (every store on that database)")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url or settings.SHARD_MAP[args.store_id])
+    start = time.perf_counter()
+    generate(engine, args)
+    print(f"done in {time.perf_counter() - start:.2f}s (seed={args.seed}, end-date={args.end_date})")
+
+
+if __name__ == "__main__":
+    main()
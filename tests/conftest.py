@@ -0,0 +1,62 @@
+"""
+Test configuration.
+
+Settings are read when `app.config` is imported, so the environment is set
+here, before any test imports the app: a throwaway SQLite database shared
+by the default store and a store `other`, a throwaway catalogue cache, and
+QUERY_BUDGET_MODE=raise so a request over its query budget fails with a 500
+instead of only logging a warning.
+"""
+import json
+import os
+import tempfile
+import uuid
+
+import pytest
+
+_data_dir = tempfile.mkdtemp(prefix="estoque-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_data_dir, 'test.db')}"
+# A second store sharing the database, to check rows stay scoped to their store
+os.environ["SHARD_MAP"] = json.dumps({"other": os.environ["DATABASE_URL"]})
+os.environ["CATALOGUE_CACHE_DIR"] = os.path.join(_data_dir, "catalogue")
+os.environ["JOB_RESULTS_DIR"] = os.path.join(_data_dir, "job_results")
+os.environ["QUERY_BUDGET_MODE"] = "raise"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def create_stock(client):
+    """Create a stock item through the API and return its id."""
+    def create(quantity: int = 10, product_price: float = 9.0, headers: dict | None = None) -> int:
+        response = client.post("/api/v1/stocks", headers=headers, json={
+            "product": f"Produto {uuid.uuid4().hex[:8]}",
+            "category": "Cervejas",
+            "quantity": quantity,
+            "product_price": product_price,
+            "product_buy": 4.0,
+        })
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+    return create
+
+
+@pytest.fixture
+def create_bill(client):
+    """Create an open bill through the API and return its id."""
+    def create(headers: dict | None = None) -> int:
+        response = client.post(
+            "/api/v1/bills", headers=headers, json={"customer_name": f"Cliente {uuid.uuid4().hex[:8]}"}
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+    return create
@@ -0,0 +1,31 @@
+import pytest
+
+
+@pytest.fixture
+def bill_id(client, create_stock, create_bill):
+    """A bill with one line."""
+    bill_id = create_bill()
+    client.post(f"/api/v1/bills/{bill_id}/items", json={"stock_id": create_stock(), "quantity": 1})
+    return bill_id
+
+
+def test_fieldset_returns_only_requested_columns(client, bill_id):
+    response = client.get(f"/api/v1/bills/{bill_id}", params={"fields": "status"})
+
+    assert response.status_code == 200
+    assert response.json() == {"id": bill_id, "status": "Aberto"}
+
+
+def test_fieldset_embeds_items_on_request(client, bill_id):
+    response = client.get(f"/api/v1/bills/{bill_id}", params={"fields": "status", "include": "items"})
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 1
+
+
+@pytest.mark.parametrize("path", ["/api/v1/bills", "/api/v1/bills/{bill_id}"])
+def test_include_without_fields_is_rejected(client, bill_id, path):
+    response = client.get(path.format(bill_id=bill_id), params={"include": "items"})
+
+    assert response.status_code == 400
+    assert "include requires fields" in response.json()["detail"]
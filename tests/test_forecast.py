@@ -0,0 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+from app.crud.forecast_crud import _forecast_lock, get_cached_reorder_points
+from app.database import session_for_store
+
+
+def forecast_of(store_id: str) -> dict:
+    with session_for_store(store_id) as db:
+        return get_cached_reorder_points(db)
+
+
+def test_forecast_lock_only_serialises_misses_of_one_store(client, create_stock):
+    create_stock(headers={"X-Store-ID": "other"})
+    warm = forecast_of(settings.DEFAULT_STORE_ID)
+
+    # While the default store recomputes, its cache hits and other stores proceed
+    with ThreadPoolExecutor(2) as pool, _forecast_lock(settings.DEFAULT_STORE_ID):
+        hit = pool.submit(forecast_of, settings.DEFAULT_STORE_ID)
+        other = pool.submit(forecast_of, "other")
+
+        assert hit.result(timeout=5) is warm
+        assert len(other.result(timeout=5)["stock_id"]) >= 1
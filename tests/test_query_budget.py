@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import select
+
+from app.database import session_for_store
+from app.models.bill import Bill
+from app.models.stock import Stock
+from app.query_budget import QueryBudget, QueryBudgetExceeded
+from app.routers import bill_router
+
+
+@pytest.fixture
+def bill_with_items(client, create_stock, create_bill):
+    """An open bill with three lines, each of a different product."""
+    bill_id = create_bill()
+    for _ in range(3):
+        response = client.post(f"/api/v1/bills/{bill_id}/items", json={"stock_id": create_stock(), "quantity": 1})
+        assert response.status_code == 201
+    return bill_id
+
+
+def test_route_within_budget_passes(client, bill_with_items):
+    response = client.get(f"/api/v1/bills/{bill_with_items}")
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+
+
+def test_lazy_loading_route_fails_its_budget(client, bill_with_items, monkeypatch):
+    # Without eager loading, serializing the bill loads every item's stock one by one
+    monkeypatch.setattr(bill_router, "get_bill_by_id", lambda db, bill_id: db.get(Bill, bill_id))
+
+    response = client.get(f"/api/v1/bills/{bill_with_items}")
+
+    assert response.status_code == 500
+    detail = response.json()["detail"]
+    assert f"Query budget exceeded in GET /api/v1/bills/{bill_with_items}" in detail
+    assert "lazy load of BillItem.stock" in detail
+
+
+def test_context_manager_raises_when_exceeded(client):
+    db = session_for_store("default")
+    try:
+        with pytest.raises(QueryBudgetExceeded, match="2 statements, budget is 1"):
+            with QueryBudget(max_queries=1, mode="raise"):
+                db.execute(select(Stock.id)).all()
+                db.execute(select(Bill.id)).all()
+    finally:
+        db.close()
+
+
+def test_decorator_counts_each_call_separately(client):
+    @QueryBudget(max_queries=1, mode="raise")
+    def count_stocks(db):
+        return len(db.execute(select(Stock.id)).all())
+
+    db = session_for_store("default")
+    try:
+        count_stocks(db)
+        count_stocks(db)
+    finally:
+        db.close()
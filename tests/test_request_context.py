@@ -0,0 +1,33 @@
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.logging_config import setup_logging, stop_logging
+from app.main import app
+from app.routers import bill_router
+
+
+def test_request_id_is_echoed(client):
+    response = client.get("/api/v1/health", headers={"X-Request-ID": "abc123"})
+
+    assert response.headers["x-request-id"] == "abc123"
+
+
+def test_unhandled_error_returns_the_request_id(monkeypatch):
+    def explode(db):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(bill_router, "get_all_bills", explode)
+
+    with TestClient(app, raise_server_exceptions=False) as client:
+        response = client.get("/api/v1/bills", headers={"X-Request-ID": "req-500"})
+
+    assert response.status_code == 500
+    assert response.headers["x-request-id"] == "req-500"
+
+
+def test_stop_logging_detaches_the_queue_handler():
+    setup_logging()
+    stop_logging()
+
+    assert logging.getLogger().handlers == []
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy import update
+
+from app.crud.reservation_crud import release_expired_reservations
+from app.database import session_for_store
+from app.models.reservation import StockReservation
+from app.models.stock import Stock
+
+
+def availability(client, stock_id: int) -> dict:
+    return client.get(f"/api/v1/stocks/{stock_id}/availability").json()
+
+
+def reserve(client, bill_id: int, stock_id: int, quantity: int):
+    return client.post(f"/api/v1/bills/{bill_id}/reservations", json={"stock_id": stock_id, "quantity": quantity})
+
+
+def test_reservation_holds_units(client, create_stock, create_bill):
+    stock_id, bill_id = create_stock(quantity=10), create_bill()
+
+    response = reserve(client, bill_id, stock_id, 3)
+
+    assert response.status_code == 201
+    assert availability(client, stock_id) == {"stock_id": stock_id, "on_hand": 10, "reserved": 3, "available": 7}
+
+
+def test_reservation_beyond_availability_is_rejected(client, create_stock, create_bill):
+    stock_id, bill_id = create_stock(quantity=10), create_bill()
+    reserve(client, bill_id, stock_id, 8)
+
+    response = reserve(client, create_bill(), stock_id, 3)
+
+    assert response.status_code == 400
+    assert "Available: 2" in response.json()["detail"]
+    assert availability(client, stock_id)["reserved"] == 8
+
+
+def test_checkout_turns_holds_into_bill_items(client, create_stock, create_bill):
+    stock_id, bill_id = create_stock(quantity=10, product_price=5.0), create_bill()
+    reserve(client, bill_id, stock_id, 2)
+    reserve(client, bill_id, stock_id, 1)
+
+    response = client.post(f"/api/v1/bills/{bill_id}/checkout")
+
+    assert response.status_code == 200
+    bill = response.json()
+    assert bill["status"] == "Fechado"
+    assert [(item["stock_id"], item["quantity"], item["unit_price"]) for item in bill["items"]] == [(stock_id, 3, 5.0)]
+    assert availability(client, stock_id) == {"stock_id": stock_id, "on_hand": 7, "reserved": 0, "available": 7}
+    assert client.get(f"/api/v1/bills/{bill_id}/reservations").json() == []
+
+
+def test_closed_bill_takes_no_more_stock(client, create_stock, create_bill):
+    stock_id, bill_id = create_stock(), create_bill()
+    client.post(f"/api/v1/bills/{bill_id}/checkout")
+
+    for response in (
+        reserve(client, bill_id, stock_id, 1),
+        client.post(f"/api/v1/bills/{bill_id}/items", json={"stock_id": stock_id, "quantity": 1}),
+        client.post(f"/api/v1/bills/{bill_id}/checkout"),
+    ):
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Bill is closed"
+
+
+def test_expired_holds_are_released(client, create_stock, create_bill):
+    stock_id, bill_id = create_stock(quantity=10), create_bill()
+    expired_id = reserve(client, bill_id, stock_id, 4).json()["id"]
+    reserve(client, bill_id, stock_id, 1)
+
+    db = session_for_store("default")
+    try:
+        db.execute(
+            update(StockReservation)
+            .where(StockReservation.id == expired_id)
+            .values(expires_at=datetime.now(UTC) - timedelta(seconds=1))
+        )
+        db.commit()
+        assert release_expired_reservations(db, batch_size=100) == 1
+    finally:
+        db.close()
+
+    assert availability(client, stock_id)["reserved"] == 1
+    assert [hold["quantity"] for hold in client.get(f"/api/v1/bills/{bill_id}/reservations").json()] == [1]
+
+
+def test_quantity_cannot_drop_below_reserved(client, create_stock, create_bill):
+    stock_id, bill_id = create_stock(quantity=10), create_bill()
+    reserve(client, bill_id, stock_id, 4)
+
+    response = client.patch(f"/api/v1/stocks/{stock_id}", json={"quantity": 3})
+
+    assert response.status_code == 400
+    assert client.patch(f"/api/v1/stocks/{stock_id}", json={"quantity": 4}).status_code == 200
+
+
+def test_null_quantity_counts_as_empty(client, create_stock, create_bill):
+    stock_id, bill_id = create_stock(), create_bill()
+    db = session_for_store("default")
+    try:
+        db.execute(update(Stock).where(Stock.id == stock_id).values(quantity=None))
+        db.commit()
+    finally:
+        db.close()
+
+    for response in (
+        reserve(client, bill_id, stock_id, 1),
+        client.post(f"/api/v1/bills/{bill_id}/items", json={"stock_id": stock_id, "quantity": 1}),
+    ):
+        assert response.status_code == 400
+        assert "Available: 0" in response.json()["detail"]
@@ -0,0 +1,76 @@
+"""Two stores share one database; neither may see or touch the other's rows."""
+import pytest
+
+OTHER = {"X-Store-ID": "other"}
+
+
+@pytest.fixture
+def default_store_rows(client, create_stock, create_bill):
+    """A stock item, and a bill holding a line and a reservation of it, in the default store."""
+    stock_id, bill_id = create_stock(), create_bill()
+    client.post(f"/api/v1/bills/{bill_id}/items", json={"stock_id": stock_id, "quantity": 1})
+    client.post(f"/api/v1/bills/{bill_id}/reservations", json={"stock_id": stock_id, "quantity": 1})
+    return stock_id, bill_id
+
+
+def test_lists_only_show_own_rows(client, default_store_rows, create_stock):
+    stock_id, bill_id = default_store_rows
+    other_stock_id = create_stock(headers=OTHER)
+
+    stock_ids = [stock["id"] for stock in client.get("/api/v1/stocks", headers=OTHER).json()]
+    sparse_ids = [stock["id"] for stock in client.get("/api/v1/stocks?fields=id", headers=OTHER).json()]
+    bill_ids = [bill["id"] for bill in client.get("/api/v1/bills", headers=OTHER).json()]
+
+    assert other_stock_id in stock_ids
+    assert stock_id not in stock_ids
+    assert stock_id not in sparse_ids
+    assert bill_id not in bill_ids
+
+
+@pytest.mark.parametrize("path", [
+    "/api/v1/stocks/{stock_id}",
+    "/api/v1/stocks/{stock_id}?fields=quantity",
+    "/api/v1/stocks/{stock_id}/availability",
+    "/api/v1/bills/{bill_id}",
+    "/api/v1/bills/{bill_id}?fields=status",
+])
+def test_reads_of_other_store_rows_are_not_found(client, default_store_rows, path):
+    stock_id, bill_id = default_store_rows
+
+    response = client.get(path.format(stock_id=stock_id, bill_id=bill_id), headers=OTHER)
+
+    assert response.status_code == 404
+
+
+def test_batch_does_not_resolve_other_store_rows(client, default_store_rows):
+    stock_id, bill_id = default_store_rows
+
+    response = client.post("/api/v1/batch", json={"stocks": [stock_id], "bills": [bill_id]}, headers=OTHER)
+
+    assert response.status_code == 200
+    assert [entry["status"] for entry in response.json()["stocks"] + response.json()["bills"]] == [404, 404]
+
+
+def test_writes_to_other_store_rows_are_not_found(client, default_store_rows, create_stock, create_bill):
+    stock_id, bill_id = default_store_rows
+    other_stock_id, other_bill_id = create_stock(headers=OTHER), create_bill(headers=OTHER)
+
+    for response in (
+        # Their bill, their stock, and each mixed with ours
+        client.post(f"/api/v1/bills/{bill_id}/items", json={"stock_id": stock_id, "quantity": 1}, headers=OTHER),
+        client.post(f"/api/v1/bills/{bill_id}/items", json={"stock_id": other_stock_id, "quantity": 1}, headers=OTHER),
+        client.post(f"/api/v1/bills/{other_bill_id}/items", json={"stock_id": stock_id, "quantity": 1}, headers=OTHER),
+        client.post(f"/api/v1/bills/{bill_id}/reservations", json={"stock_id": stock_id, "quantity": 1}, headers=OTHER),
+        client.post(f"/api/v1/bills/{other_bill_id}/reservations", json={"stock_id": stock_id, "quantity": 1},
+                    headers=OTHER),
+        client.patch(f"/api/v1/stocks/{stock_id}", json={"quantity": 99}, headers=OTHER),
+        client.delete(f"/api/v1/bills/{bill_id}", headers=OTHER),
+    ):
+        assert response.status_code == 404, response.text
+
+    assert client.get(f"/api/v1/stocks/{stock_id}/availability").json()["on_hand"] == 9
+    assert client.get(f"/api/v1/bills/{bill_id}").status_code == 200
+
+
+def test_unknown_store_is_not_found(client):
+    assert client.get("/api/v1/stocks", headers={"X-Store-ID": "nowhere"}).status_code == 404
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from app.config import settings
+from app.database import session_for_store
+from app.models.bill import Bill
+from app.models.billitem import BillItem
+from app.models.stock import Stock
+from app.models.tombstone import SyncTombstone
+
+# Every row the test pages over is stamped with this one instant
+TIED_AT = datetime(2001, 1, 1, 12, 0, 0)
+
+
+def backdate_all_changes() -> None:
+    with session_for_store(settings.DEFAULT_STORE_ID) as db:
+        for model, column in ((Stock, Stock.updated_at), (Bill, Bill.updated_at),
+                              (BillItem, BillItem.updated_at), (SyncTombstone, SyncTombstone.deleted_at)):
+            db.execute(update(model).values({column.key: TIED_AT}))
+        db.commit()
+
+
+@pytest.fixture
+def tied_changes(client, create_stock, create_bill, monkeypatch):
+    """Stocks, a bill with items and a tombstone, all changed at the same instant."""
+    stock_ids = [create_stock() for _ in range(5)]
+    bill_id = create_bill()
+    item_ids = [
+        client.post(f"/api/v1/bills/{bill_id}/items", json={"stock_id": stock_id, "quantity": 1}).json()["id"]
+        for stock_id in stock_ids[:3]
+    ]
+    deleted_id = create_stock()
+    assert client.delete(f"/api/v1/stocks/{deleted_id}").status_code == 204
+    backdate_all_changes()
+    # Only the backdated rows are past the safety lag, so pages are stable
+    monkeypatch.setattr(settings, "SYNC_SAFETY_LAG_SECONDS", 3600)
+    return stock_ids, bill_id, item_ids, deleted_id
+
+
+def test_paging_through_tied_timestamps_skips_and_repeats_nothing(client, tied_changes):
+    full = client.get("/api/v1/sync/changes", params={"limit": 5000}).json()
+    assert not full["has_more"]
+
+    paged, since = [], None
+    for _ in range(len(full["changes"]) + 1):
+        params = {"limit": 2} | ({"since": since} if since else {})
+        page = client.get("/api/v1/sync/changes", params=params).json()
+        assert len(page["changes"]) <= 2
+        paged += page["changes"]
+        since = page["next_cursor"]
+        if not page["has_more"]:
+            break
+
+    keys = [(change["entity"], change["op"], change["id"]) for change in paged]
+    assert len(keys) == len(set(keys))
+    assert paged == full["changes"]
+
+    stock_ids, bill_id, item_ids, deleted_id = tied_changes
+    assert {("stock", "upsert", stock_id) for stock_id in stock_ids} <= set(keys)
+    assert {("bill_item", "upsert", item_id) for item_id in item_ids} <= set(keys)
+    assert ("bill", "upsert", bill_id) in keys
+    assert ("stock", "delete", deleted_id) in keys
+
+
+def test_cursor_at_end_returns_no_changes(client, tied_changes):
+    full = client.get("/api/v1/sync/changes", params={"limit": 5000}).json()
+
+    response = client.get("/api/v1/sync/changes", params={"since": full["next_cursor"]})
+
+    assert response.json() == {"changes": [], "next_cursor": full["next_cursor"], "has_more": False}
@@ -0,0 +1,107 @@
+import pytest
+
+from app.config import settings
+
+
+def on_hand(client, stock_id: int) -> int:
+    return client.get(f"/api/v1/stocks/{stock_id}/availability").json()["on_hand"]
+
+
+def sell(client, bill_id: int, stock_id: int, quantity: int) -> int:
+    response = client.post(f"/api/v1/bills/{bill_id}/items", json={"stock_id": stock_id, "quantity": quantity})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def void(client, bill_id: int, item_ids: list[int]):
+    return client.post(f"/api/v1/bills/{bill_id}/items/void", json={"item_ids": item_ids})
+
+
+@pytest.fixture
+def sharded_stock(client, create_stock):
+    """A stock item of 40 units split over 4 shards."""
+    stock_id = create_stock(quantity=40)
+    assert client.put(f"/api/v1/stocks/{stock_id}/shards", json={"shard_count": 4}).status_code == 200
+    return stock_id
+
+
+def test_void_restores_every_line(client, create_stock, create_bill, sharded_stock):
+    plain_id, bill_id = create_stock(quantity=10), create_bill()
+    item_ids = [sell(client, bill_id, plain_id, 2), sell(client, bill_id, plain_id, 3),
+                sell(client, bill_id, sharded_stock, 5)]
+    kept_id = sell(client, bill_id, plain_id, 1)
+    shards_before = client.get(f"/api/v1/stocks/{sharded_stock}/shards").json()["shards"]
+
+    response = void(client, bill_id, item_ids)
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == [kept_id]
+    assert on_hand(client, plain_id) == 9
+    # Units of sharded items go back to shard 0
+    layout = client.get(f"/api/v1/stocks/{sharded_stock}/shards").json()
+    assert layout["quantity"] == 40
+    assert layout["shards"] == [shards_before[0] + 5, *shards_before[1:]]
+
+
+def test_void_is_all_or_nothing(client, create_stock, create_bill):
+    stock_id, bill_id = create_stock(quantity=10), create_bill()
+    item_id = sell(client, bill_id, stock_id, 4)
+    other_bill_item = sell(client, create_bill(), stock_id, 1)
+
+    response = void(client, bill_id, [item_id, other_bill_item, 999_999])
+
+    assert response.status_code == 404
+    assert str([other_bill_item, 999_999]) in response.json()["detail"]
+    assert on_hand(client, stock_id) == 5
+    assert client.delete(f"/api/v1/bills/{bill_id}/items/999999").status_code == 404
+    assert void(client, 999_999, [item_id]).status_code == 404
+
+
+def test_delete_bill_restores_its_items(client, create_stock, create_bill, sharded_stock):
+    plain_id, bill_id = create_stock(quantity=10), create_bill()
+    sell(client, bill_id, plain_id, 3)
+    sell(client, bill_id, sharded_stock, 6)
+    client.post(f"/api/v1/bills/{bill_id}/reservations", json={"stock_id": plain_id, "quantity": 2})
+
+    assert client.delete(f"/api/v1/bills/{bill_id}").status_code == 204
+
+    assert client.get(f"/api/v1/bills/{bill_id}").status_code == 404
+    assert client.get(f"/api/v1/stocks/{plain_id}/availability").json() == {
+        "stock_id": plain_id, "on_hand": 10, "reserved": 0, "available": 10
+    }
+    assert client.get(f"/api/v1/stocks/{sharded_stock}/shards").json()["quantity"] == 40
+    assert client.delete(f"/api/v1/bills/{bill_id}").status_code == 404
+
+
+def test_voids_and_deletes_are_tombstoned_for_sync(client, create_stock, create_bill, monkeypatch):
+    stock_id, bill_id, deleted_bill_id = create_stock(), create_bill(), create_bill()
+    voided = sell(client, bill_id, stock_id, 1)
+    single = sell(client, bill_id, stock_id, 1)
+    cascaded = sell(client, deleted_bill_id, stock_id, 1)
+    void(client, bill_id, [voided])
+    client.delete(f"/api/v1/bills/{bill_id}/items/{single}")
+    client.delete(f"/api/v1/bills/{deleted_bill_id}")
+    monkeypatch.setattr(settings, "SYNC_SAFETY_LAG_SECONDS", 0)
+
+    changes = client.get("/api/v1/sync/changes", params={"limit": 5000}).json()["changes"]
+
+    deletes = {(change["entity"], change["id"]) for change in changes if change["op"] == "delete"}
+    assert {("bill_item", voided), ("bill_item", single), ("bill_item", cascaded),
+            ("bill", deleted_bill_id)} <= deletes
+
+
+def test_closed_bill_cannot_be_voided_or_deleted(client, create_stock, create_bill):
+    stock_id, bill_id = create_stock(quantity=10), create_bill()
+    item_id = sell(client, bill_id, stock_id, 4)
+    assert client.post(f"/api/v1/bills/{bill_id}/checkout").status_code == 200
+
+    for response in (
+        void(client, bill_id, [item_id]),
+        client.delete(f"/api/v1/bills/{bill_id}/items/{item_id}"),
+        client.delete(f"/api/v1/bills/{bill_id}"),
+    ):
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Bill is closed"
+
+    assert on_hand(client, stock_id) == 6
+    assert [item["id"] for item in client.get(f"/api/v1/bills/{bill_id}").json()["items"]] == [item_id]